@@ -0,0 +1,95 @@
+"""
+Benchmark alokacji efektów opartych na przesuwaniu (rgb_shift, h_shift, scanlines).
+
+Porównuje dawną implementację z np.roll (nowa tablica przy każdym przesunięciu)
+z obecnym jądrem roll_inplace korzystającym z bufora roboczego.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_roll_effects [szerokość] [wysokość]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from core.effects import effect_rgb_shift, effect_horizontal_shift, effect_scanlines
+
+
+def legacy_rgb_shift(arr, intensity, params, rng):
+    max_shift = params.get('max_shift', 15)
+    shift_r = rng.randint(-int(max_shift * intensity), int(max_shift * intensity))
+    shift_b = rng.randint(-int(max_shift * intensity), int(max_shift * intensity))
+    arr[:, :, 0] = np.roll(arr[:, :, 0], shift_r, axis=1)
+    arr[:, :, 2] = np.roll(arr[:, :, 2], shift_b, axis=1)
+    return arr
+
+
+def legacy_horizontal_shift(arr, intensity, params, rng):
+    height = arr.shape[0]
+    num_strips = int(params.get('num_strips', 3) * intensity)
+    max_height_pct = params.get('max_height_pct', 0.15)
+    max_shift_pct = params.get('max_shift_pct', 0.2)
+    for _ in range(num_strips):
+        y_start = rng.randint(0, height - 1)
+        h = rng.randint(5, max(6, int(height * max_height_pct * intensity)))
+        y_end = min(y_start + h, height)
+        shift = rng.randint(-int(arr.shape[1] * max_shift_pct * intensity), int(arr.shape[1] * max_shift_pct * intensity))
+        arr[y_start:y_end] = np.roll(arr[y_start:y_end], shift, axis=1)
+    return arr
+
+
+def legacy_scanlines(arr, intensity, params, rng):
+    height = arr.shape[0]
+    num_lines = int(params.get('num_lines', 10) * intensity)
+    max_shift = params.get('max_shift', 30)
+    for _ in range(num_lines):
+        y = rng.randint(0, height - 1)
+        shift = rng.randint(-max_shift, max_shift)
+        arr[y] = np.roll(arr[y], shift, axis=0)
+    return arr
+
+
+CASES = [
+    ('rgb_shift', legacy_rgb_shift, effect_rgb_shift),
+    ('h_shift', legacy_horizontal_shift, effect_horizontal_shift),
+    ('scanlines', legacy_scanlines, effect_scanlines),
+]
+
+
+def peak_bytes(func, frame, intensity=2.0):
+    """Szczytowe zużycie pamięci (bajty) ponad kopię klatki podczas jednego wywołania."""
+    arr = frame.copy()
+    func(arr, intensity, {}, random.Random(0))
+    arr = frame.copy()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func(arr, intensity, {}, random.Random(1))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 1920
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 1080
+    frame = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    print(f"Klatka {width}x{height}x3")
+    print(f"{'efekt':<10} {'wersja':<8} {'szczyt [KiB]':>13} {'ms/klatkę':>10}")
+    for name, legacy, current in CASES:
+        a = legacy(frame.copy(), 2.0, {}, random.Random(7))
+        b = current(frame.copy(), 2.0, {}, random.Random(7))
+        assert np.array_equal(a, b), f"{name}: wyniki różnią się"
+        for label, func in (('np.roll', legacy), ('inplace', current)):
+            arr = frame.copy()
+            start = time.perf_counter()
+            for i in range(20):
+                func(arr, 2.0, {}, random.Random(i))
+            ms = (time.perf_counter() - start) / 20 * 1000
+            print(f"{name:<10} {label:<8} {peak_bytes(func, frame) / 1024:>13.1f} {ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,7 @@ Effects registry and default parameters for Glitch Lab.
 from core.effects import (
     effect_rgb_shift, effect_horizontal_shift, effect_block_displacement,
     effect_scanlines, effect_color_channel_swap,
-    effect_noise_bands, effect_vhs_tracking
+    effect_noise_bands, effect_vhs_tracking, effect_jpeg_artifacts
 )
 from config.languages import language_manager
 
@@ -19,7 +19,7 @@ def get_effects():
         'color_swap': (language_manager.get_effect_name('color_swap'), effect_color_channel_swap),
         'noise': (language_manager.get_effect_name('noise'), effect_noise_bands),
         'vhs': (language_manager.get_effect_name('vhs'), effect_vhs_tracking),
-        'jpeg': (language_manager.get_effect_name('jpeg'), None),
+        'jpeg': (language_manager.get_effect_name('jpeg'), effect_jpeg_artifacts),
     }
 
 # For backward compatibility
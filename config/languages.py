@@ -33,6 +33,13 @@ TRANSLATIONS = {
         'new_output': 'Nowy Output',
         'reimport': 'Reimportuj',
         'generate': '🎬 GENERUJ',
+        'incremental_render': 'Render przyrostowy (tylko zmienione klatki)',
+        'frame_cache': 'Cache klatek na dysku (do 2 GB w ~/.cache/glitchlab)',
+        'render_seed': 'Seed (puste = automatyczny):',
+        'new_seed': '🎲 Nowy seed',
+        'pause_render': '⏸ Pauza',
+        'resume_render': '▶ Wznów',
+        'cancel_render': '⏹ Przerwij',
         'refresh': '🔄 Odśwież',
         'preview': '👁️ Podgląd',
         'all_effects': 'Wszystkie',
@@ -89,6 +96,10 @@ TRANSLATIONS = {
         'status_processing': 'Przetwarzanie...',
         'status_error': 'Błąd!',
         'status_complete': 'Gotowe! {count} klatek',
+        'status_job_progress': '{done}/{total} klatek • {fps} kl/s • ETA {eta}',
+        'status_paused': 'Wstrzymano ({done}/{total} klatek)',
+        'status_cancelling': 'Przerywanie...',
+        'status_cancelled': 'Przerwano ({count} klatek)',
         
         # Descriptions
         'multiplier_desc': 'Duplikuje każdą klatkę X razy i numeruje je kolejno.\nNp. mnożnik 2: klatka_01 → klatka_01, klatka_02',
@@ -97,6 +108,7 @@ TRANSLATIONS = {
         'error_no_pil': 'Brak bibliotek!\n\npip install Pillow numpy',
         'error_no_input': 'Wybierz katalog z klatkami!',
         'error_input_not_exists': 'Katalog wejściowy nie istnieje!',
+        'error_invalid_seed': 'Seed musi być liczbą całkowitą!',
         'warning_no_output_first': 'Najpierw wybierz katalog wejściowy!',
         'warning_no_output_exists': 'Katalog wyjściowy nie istnieje!',
         'warning_no_images': 'W katalogu wyjściowym nie znaleziono plików obrazów!',
@@ -163,7 +175,14 @@ TRANSLATIONS = {
         'log_pattern_info': 'Wzorzec: {pattern}',
         'log_intensity_mode_info': 'Animacja intensywności: {mode}',
         'log_advanced_mode_info': 'Tryb zaawansowany: WŁĄCZONY',
+        'log_seed_info': 'Seed renderu: {seed}',
+        'log_incremental_info': 'Render przyrostowy: WŁĄCZONY',
+        'log_render_paused': 'Render wstrzymany',
+        'log_render_resumed': 'Render wznowiony',
+        'log_render_cancelled': 'Render przerwany: zapisano {done}/{total} klatek',
+        'log_render_cancelled_resumable': 'Render przerwany: zapisano {done}/{total} klatek (można dokończyć renderem przyrostowym)',
         'log_progress': 'Postęp: {percent}%',
+        'log_messages_skipped': '… pominięto {count} komunikatów',
         'log_completed': 'Zakończono! Utworzono {count} klatek',
         'log_saved_to': 'Zapisano do: {path}',
         'log_error': 'BŁĄD: {error}',
@@ -189,6 +208,13 @@ TRANSLATIONS = {
         'new_output': 'New Output',
         'reimport': 'Reimport',
         'generate': '🎬 GENERATE',
+        'incremental_render': 'Incremental render (changed frames only)',
+        'frame_cache': 'On-disk frame cache (up to 2 GB in ~/.cache/glitchlab)',
+        'render_seed': 'Seed (empty = automatic):',
+        'new_seed': '🎲 New seed',
+        'pause_render': '⏸ Pause',
+        'resume_render': '▶ Resume',
+        'cancel_render': '⏹ Cancel',
         'refresh': '🔄 Refresh',
         'preview': '👁️ Preview',
         'all_effects': 'All',
@@ -245,6 +271,10 @@ TRANSLATIONS = {
         'status_processing': 'Processing...',
         'status_error': 'Error!',
         'status_complete': 'Done! {count} frames',
+        'status_job_progress': '{done}/{total} frames • {fps} fps • ETA {eta}',
+        'status_paused': 'Paused ({done}/{total} frames)',
+        'status_cancelling': 'Cancelling...',
+        'status_cancelled': 'Cancelled ({count} frames)',
         
         # Descriptions
         'multiplier_desc': 'Duplicates each frame X times and numbers them sequentially.\nE.g. multiplier 2: frame_01 → frame_01, frame_02',
@@ -253,6 +283,7 @@ TRANSLATIONS = {
         'error_no_pil': 'Missing libraries!\n\npip install Pillow numpy',
         'error_no_input': 'Select input directory!',
         'error_input_not_exists': 'Input directory does not exist!',
+        'error_invalid_seed': 'Seed must be an integer!',
         'warning_no_output_first': 'First select input directory!',
         'warning_no_output_exists': 'Output directory does not exist!',
         'warning_no_images': 'No image files found in output directory!',
@@ -319,7 +350,14 @@ TRANSLATIONS = {
         'log_pattern_info': 'Pattern: {pattern}',
         'log_intensity_mode_info': 'Intensity animation: {mode}',
         'log_advanced_mode_info': 'Advanced mode: ENABLED',
+        'log_seed_info': 'Render seed: {seed}',
+        'log_incremental_info': 'Incremental render: ENABLED',
+        'log_render_paused': 'Render paused',
+        'log_render_resumed': 'Render resumed',
+        'log_render_cancelled': 'Render cancelled: {done}/{total} frames saved',
+        'log_render_cancelled_resumable': 'Render cancelled: {done}/{total} frames saved (finish with an incremental render)',
         'log_progress': 'Progress: {percent}%',
+        'log_messages_skipped': '… skipped {count} messages',
         'log_completed': 'Completed! Created {count} frames',
         'log_saved_to': 'Saved to: {path}',
         'log_error': 'ERROR: {error}',
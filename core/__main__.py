@@ -0,0 +1,11 @@
+"""
+Entry point for ``python -m core`` (headless renderer).
+"""
+
+import sys
+
+from core.cli import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
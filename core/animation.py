@@ -88,8 +88,13 @@ def calculate_intensity_from_keyframes(frame_idx, total_frames, keyframes, base_
     return base_intensity
 
 
-def calculate_glitch_intensity(frame_idx, total_frames, base_intensity, anim_params):
-    """Oblicza intensywność glitcha dla danej klatki."""
+def calculate_glitch_intensity(frame_idx, total_frames, base_intensity, anim_params, rng=None):
+    """Oblicza intensywność glitcha dla danej klatki.
+    
+    rng - generator losowy (random.Random) dla trybów 'random'; domyślnie moduł random.
+    """
+    if rng is None:
+        rng = random
     pattern_mode = anim_params.get('pattern_mode', 'every')
     
     # Obsługa keyframe'ów
@@ -112,7 +117,7 @@ def calculate_glitch_intensity(frame_idx, total_frames, base_intensity, anim_par
         should_glitch = (frame_idx % n == 0)
     elif pattern_mode == 'random':
         chance = anim_params.get('random_chance', 50) / 100.0
-        should_glitch = random.random() < chance
+        should_glitch = rng.random() < chance
     elif pattern_mode == 'burst':
         on_frames = anim_params.get('burst_on', 3)
         off_frames = anim_params.get('burst_off', 5)
@@ -136,6 +141,6 @@ def calculate_glitch_intensity(frame_idx, total_frames, base_intensity, anim_par
         cycles = anim_params.get('pulse_cycles', 3)
         intensity = base_intensity * (0.3 + 0.7 * abs(math.sin(progress * math.pi * cycles)))
     elif intensity_mode == 'random':
-        intensity = base_intensity * random.uniform(0.3, 1.0)
+        intensity = base_intensity * rng.uniform(0.3, 1.0)
     
     return True, max(0.1, intensity)
\ No newline at end of file
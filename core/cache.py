@@ -0,0 +1,127 @@
+"""
+Content-addressed on-disk cache of rendered frames for Glitch Lab.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+
+DEFAULT_CACHE_BYTES = 2 * 1024 ** 3
+
+
+def default_cache_dir():
+    """Katalog cache: GLITCHLAB_CACHE_DIR albo ~/.cache/glitchlab/frames."""
+    env_dir = os.environ.get('GLITCHLAB_CACHE_DIR')
+    if env_dir:
+        return Path(env_dir)
+    return Path.home() / '.cache' / 'glitchlab' / 'frames'
+
+
+def cache_key(source_digest, plan_digest, intensity, seed, output_frame_idx):
+    """Klucz klatki wyrenderowanej: źródło + łańcuch efektów + intensywność + generator.
+    
+    Generator efektów klatki zależy od (seed, indeks klatki wyjściowej), więc oba
+    wchodzą do klucza. Intensywność jest zaokrąglana jak w manifeście renderu.
+    """
+    payload = json.dumps([source_digest, plan_digest, round(float(intensity), 6), seed, output_frame_idx])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """Cache wyrenderowanych klatek adresowany treścią, z limitem rozmiaru (LRU).
+    
+    Pliki leżą w cache_dir/<2 znaki klucza>/<klucz>.<rozszerzenie>. Trafienie
+    odświeża czas modyfikacji pliku, a po przekroczeniu max_bytes usuwane są
+    pliki najdawniej używane. Zapisy są atomowe (plik tymczasowy + os.replace),
+    więc z jednego katalogu może korzystać kilka procesów naraz.
+    """
+    
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size = None
+    
+    def _path(self, key, ext):
+        return self.cache_dir / key[:2] / f"{key}.{ext.lstrip('.').lower()}"
+    
+    def _entries(self):
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for sub in self.cache_dir.iterdir():
+            if not sub.is_dir():
+                continue
+            for path in sub.iterdir():
+                if path.name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+    
+    def size(self):
+        """Łączny rozmiar plików w cache (bajty)."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            return self._size
+    
+    def fetch(self, key, dest_path):
+        """Kopiuje klatkę z cache do dest_path; zwraca False przy braku wpisu."""
+        path = self._path(key, Path(dest_path).suffix)
+        try:
+            shutil.copyfile(path, dest_path)
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+    
+    def store(self, key, src_path):
+        """Zapisuje wyrenderowany plik src_path pod kluczem i pilnuje limitu rozmiaru."""
+        path = self._path(key, Path(src_path).suffix)
+        if path.exists():
+            os.utime(path)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, path)
+        added = path.stat().st_size
+        with self._lock:
+            if self._size is not None:
+                self._size += added
+        if self.size() > self.max_bytes:
+            # Sprzątanie z zapasem, aby kolejne zapisy nie skanowały katalogu od razu
+            self.evict(int(self.max_bytes * 0.9))
+    
+    def evict(self, max_bytes=None):
+        """Usuwa najdawniej używane pliki, aż rozmiar cache zmieści się w limicie."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= limit:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+            self._size = total
+        return total
+    
+    def clear(self):
+        """Usuwa całą zawartość cache."""
+        return self.evict(0)
@@ -0,0 +1,164 @@
+"""
+Headless command-line renderer for Glitch Lab (no tkinter).
+
+Uruchomienie:
+    python -m core WEJŚCIE WYJŚCIE [-m MNOŻNIK] [-i INTENSYWNOŚĆ] [-e EFEKTY] ...
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from core.processing import process_frames
+from config.effects_registry import EFFECTS
+
+
+def _load_json(value):
+    """Wczytuje JSON podany bezpośrednio ('{...}') albo ścieżką do pliku."""
+    if value is None:
+        return None
+    text = value if value.lstrip().startswith(('{', '[')) else Path(value).read_text(encoding='utf-8')
+    return json.loads(text)
+
+
+def anim_params_from_json(data):
+    """Zamienia JSON animacji na anim_params dla process_frames.
+    
+    Przyjmuje plik zapisany przez AnimationEditorWindow.export_json
+    ({'keyframes', 'total_frames', 'base_intensity'}) albo gotowy słownik
+    anim_params z kluczem 'pattern_mode'.
+    """
+    if data is None:
+        return None, None
+    if 'pattern_mode' in data:
+        return dict(data), None
+    if 'keyframes' in data:
+        return {'pattern_mode': 'keyframes', 'keyframes': data['keyframes']}, data.get('base_intensity')
+    raise ValueError("JSON animacji musi zawierać 'keyframes' albo 'pattern_mode'")
+
+
+def parse_effects(value):
+    """Lista efektów z 'all' albo listy kluczy rozdzielonych przecinkami."""
+    if value == 'all':
+        return list(EFFECTS)
+    effects = [key.strip() for key in value.split(',') if key.strip()]
+    unknown = [key for key in effects if key not in EFFECTS]
+    if unknown:
+        raise ValueError(f"Nieznane efekty: {', '.join(unknown)} (dostępne: {', '.join(EFFECTS)})")
+    return effects
+
+
+def parse_shard(value):
+    """Część renderu 'K/N' -> (K, N), K liczone od 0."""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"oczekiwano K/N, np. 0/4, otrzymano: {value}")
+    return index, count
+
+
+def parse_frame_range(value):
+    """Zakres klatek wyjściowych 'START:STOP' (STOP wyłącznie) -> (START, STOP)."""
+    try:
+        start, stop = (int(part) for part in value.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"oczekiwano START:STOP, np. 0:500, otrzymano: {value}")
+    return start, stop
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m core',
+        description="Glitch Lab - renderowanie sekwencji klatek bez interfejsu graficznego.")
+    parser.add_argument('input_dir', help="katalog z klatkami wejściowymi")
+    parser.add_argument('output_dir', help="katalog wyjściowy")
+    parser.add_argument('-m', '--multiplier', type=int, default=1, help="mnożnik klatek (domyślnie 1)")
+    parser.add_argument('-i', '--intensity', type=float, default=None,
+                        help="intensywność glitcha (domyślnie base_intensity z JSON animacji albo 1.0)")
+    parser.add_argument('-e', '--effects', default='all',
+                        help="efekty rozdzielone przecinkami albo 'all' (dostępne: " + ', '.join(EFFECTS) + ")")
+    parser.add_argument('--params', help="parametry efektów: JSON albo ścieżka do pliku JSON")
+    parser.add_argument('--anim', help="animacja: JSON z edytora animacji (export_json) albo anim_params")
+    parser.add_argument('--no-glitch', action='store_true', help="tylko powielanie klatek, bez efektów")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="liczba procesów roboczych (domyślnie liczba rdzeni CPU)")
+    parser.add_argument('--seed', type=int, default=None, help="seed renderu (domyślnie z manifestu albo losowy)")
+    parser.add_argument('--full', action='store_true',
+                        help="pełny render - ignoruje manifest poprzedniego renderu")
+    parser.add_argument('--cache', metavar='KATALOG', help="katalog cache wyrenderowanych klatek")
+    shard_group = parser.add_mutually_exclusive_group()
+    shard_group.add_argument('--shard', type=parse_shard, metavar='K/N',
+                             help="renderuj tylko część K z N (K od 0); wymaga --seed wspólnego dla części")
+    shard_group.add_argument('--frames', type=parse_frame_range, metavar='START:STOP',
+                             help="renderuj tylko klatki wyjściowe START..STOP-1 (numeracja globalna)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="bez komunikatów o każdej klatce")
+    return parser
+
+
+def make_progress_printer(quiet=False, stream=None):
+    """progress_callback wypisujący postęp na stdout (procent co 5%)."""
+    stream = stream or sys.stdout
+    last_logged = [-1]
+    
+    def report(value):
+        if isinstance(value, str):
+            if not quiet or not value.startswith('Przetwarzanie klatki'):
+                print(value, file=stream, flush=True)
+        elif int(value) % 5 == 0 and int(value) != last_logged[0]:
+            last_logged[0] = int(value)
+            print(f"Postęp: {int(value)}%", file=stream, flush=True)
+    
+    return report
+
+
+def main(argv=None):
+    """Punkt wejścia CLI; zwraca kod wyjścia."""
+    args = build_parser().parse_args(argv)
+    if not Path(args.input_dir).is_dir():
+        print(f"BŁĄD: Katalog wejściowy nie istnieje: {args.input_dir}", file=sys.stderr)
+        return 2
+    try:
+        enabled_effects = parse_effects(args.effects)
+        effect_params = _load_json(args.params) or {}
+        anim_params, base_intensity = anim_params_from_json(_load_json(args.anim))
+    except (OSError, ValueError) as e:
+        print(f"BŁĄD: {e}", file=sys.stderr)
+        return 2
+    
+    intensity = args.intensity
+    if intensity is None:
+        intensity = base_intensity if base_intensity is not None else 1.0
+    
+    cache = None
+    if args.cache:
+        from core.cache import RenderCache
+        cache = RenderCache(args.cache)
+    
+    try:
+        count, error = process_frames(
+            args.input_dir, args.output_dir,
+            args.multiplier,
+            intensity,
+            enabled_effects,
+            not args.no_glitch,
+            anim_params,
+            effect_params,
+            make_progress_printer(args.quiet),
+            workers=args.workers,
+            seed=args.seed,
+            resume=not args.full,
+            cache=cache,
+            shard=args.shard,
+            frame_range=args.frames,
+        )
+    except KeyboardInterrupt:
+        print("Przerwano - ukończone klatki są zapisane w manifeście, ponowne uruchomienie dokończy render.",
+              file=sys.stderr)
+        return 130
+    
+    if error:
+        print(f"BŁĄD: {error}", file=sys.stderr)
+        return 1
+    print(f"Zakończono! Utworzono {count} klatek")
+    return 0
@@ -3,6 +3,7 @@ Glitch effects for Glitch Lab.
 """
 
 import random
+import threading
 import numpy as np
 from io import BytesIO
 
@@ -13,72 +14,127 @@ except ImportError:
     PIL_AVAILABLE = False
 
 
-def effect_rgb_shift(arr, intensity, params=None):
+def numpy_rng(rng):
+    """Tworzy numpy Generator wyprowadzony z generatora random.Random (lub modułu random)."""
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+_scratch_local = threading.local()
+
+
+def scratch_buffer(size, dtype=np.uint8):
+    """Zwraca płaski bufor roboczy (osobny dla każdego wątku) o co najmniej size elementach.
+    
+    Bufor jest alokowany ponownie tylko gdy rośnie rozmiar klatki lub zmienia się typ.
+    """
+    buf = getattr(_scratch_local, 'buf', None)
+    if buf is None or buf.size < size or buf.dtype != dtype:
+        buf = np.empty(size, dtype=dtype)
+        _scratch_local.buf = buf
+    return buf
+
+
+def roll_inplace(view, shift, axis, scratch=None):
+    """Przesuwa cyklicznie view wzdłuż osi axis w miejscu - wynik jak np.roll, bez alokacji.
+    
+    scratch - płaski bufor o co najmniej view.size elementach; domyślnie scratch_buffer().
+    """
+    n = view.shape[axis]
+    shift %= n
+    if shift == 0:
+        return view
+    if scratch is None:
+        scratch = scratch_buffer(view.size, view.dtype)
+    tmp = scratch[:view.size].reshape(view.shape)
+    np.copyto(tmp, view)
+    head = (slice(None),) * axis
+    view[head + (slice(shift, None),)] = tmp[head + (slice(None, n - shift),)]
+    view[head + (slice(None, shift),)] = tmp[head + (slice(n - shift, None),)]
+    return view
+
+
+def _rgb_shift_amounts(intensity, params, rng):
+    """Losuje przesunięcia kanałów R i B dla effect_rgb_shift."""
+    max_shift = params.get('max_shift', 15)
+    shift_r = rng.randint(-int(max_shift * intensity), int(max_shift * intensity))
+    shift_b = rng.randint(-int(max_shift * intensity), int(max_shift * intensity))
+    return shift_r, shift_b
+
+
+def effect_rgb_shift(arr, intensity, params=None, rng=None, scratch=None):
     if params is None:
         params = {}
-    max_shift = params.get('max_shift', 15)
-    shift_r = random.randint(-int(max_shift * intensity), int(max_shift * intensity))
-    shift_b = random.randint(-int(max_shift * intensity), int(max_shift * intensity))
-    arr[:, :, 0] = np.roll(arr[:, :, 0], shift_r, axis=1)
-    arr[:, :, 2] = np.roll(arr[:, :, 2], shift_b, axis=1)
+    if rng is None:
+        rng = random
+    shift_r, shift_b = _rgb_shift_amounts(intensity, params, rng)
+    roll_inplace(arr[:, :, 0], shift_r, 1, scratch)
+    roll_inplace(arr[:, :, 2], shift_b, 1, scratch)
     return arr
 
 
-def effect_horizontal_shift(arr, intensity, params=None):
+def effect_horizontal_shift(arr, intensity, params=None, rng=None, scratch=None):
     if params is None:
         params = {}
+    if rng is None:
+        rng = random
     height = arr.shape[0]
     num_strips = int(params.get('num_strips', 3) * intensity)
     max_height_pct = params.get('max_height_pct', 0.15)
     max_shift_pct = params.get('max_shift_pct', 0.2)
     for _ in range(num_strips):
-        y_start = random.randint(0, height - 1)
-        h = random.randint(5, max(6, int(height * max_height_pct * intensity)))
+        y_start = rng.randint(0, height - 1)
+        h = rng.randint(5, max(6, int(height * max_height_pct * intensity)))
         y_end = min(y_start + h, height)
-        shift = random.randint(-int(arr.shape[1] * max_shift_pct * intensity), int(arr.shape[1] * max_shift_pct * intensity))
-        arr[y_start:y_end] = np.roll(arr[y_start:y_end], shift, axis=1)
+        shift = rng.randint(-int(arr.shape[1] * max_shift_pct * intensity), int(arr.shape[1] * max_shift_pct * intensity))
+        roll_inplace(arr[y_start:y_end], shift, 1, scratch)
     return arr
 
 
-def effect_block_displacement(arr, intensity, params=None):
+def effect_block_displacement(arr, intensity, params=None, rng=None):
     if params is None:
         params = {}
+    if rng is None:
+        rng = random
     height, width = arr.shape[:2]
     num_blocks = int(params.get('num_blocks', 2) * intensity)
     block_h_pct = params.get('block_h_pct', 0.1)
     block_w_pct = params.get('block_w_pct', 0.3)
     for _ in range(num_blocks):
-        block_h = random.randint(10, max(11, int(height * block_h_pct * intensity)))
-        block_w = random.randint(20, max(21, int(width * block_w_pct * intensity)))
-        src_y = random.randint(0, height - block_h)
-        src_x = random.randint(0, width - block_w)
-        dst_y = random.randint(0, height - block_h)
-        dst_x = random.randint(0, width - block_w)
+        block_h = rng.randint(10, max(11, int(height * block_h_pct * intensity)))
+        block_w = rng.randint(20, max(21, int(width * block_w_pct * intensity)))
+        src_y = rng.randint(0, height - block_h)
+        src_x = rng.randint(0, width - block_w)
+        dst_y = rng.randint(0, height - block_h)
+        dst_x = rng.randint(0, width - block_w)
         arr[dst_y:dst_y+block_h, dst_x:dst_x+block_w] = arr[src_y:src_y+block_h, src_x:src_x+block_w].copy()
     return arr
 
 
-def effect_scanlines(arr, intensity, params=None):
+def effect_scanlines(arr, intensity, params=None, rng=None, scratch=None):
     if params is None:
         params = {}
+    if rng is None:
+        rng = random
     height = arr.shape[0]
     num_lines = int(params.get('num_lines', 10) * intensity)
     max_shift = params.get('max_shift', 30)
     for _ in range(num_lines):
-        y = random.randint(0, height - 1)
-        shift = random.randint(-max_shift, max_shift)
-        arr[y] = np.roll(arr[y], shift, axis=0)
+        y = rng.randint(0, height - 1)
+        shift = rng.randint(-max_shift, max_shift)
+        roll_inplace(arr[y], shift, 0, scratch)
     return arr
 
 
-def effect_color_channel_swap(arr, intensity, params=None):
+def effect_color_channel_swap(arr, intensity, params=None, rng=None):
     if params is None:
         params = {}
+    if rng is None:
+        rng = random
     height = arr.shape[0]
     min_height = params.get('min_height', 50)
-    y_start = random.randint(0, height // 2)
-    y_end = random.randint(y_start + min_height, height)
-    swap_type = random.choice(['rgb_to_brg', 'rgb_to_gbr', 'invert_one'])
+    y_start = rng.randint(0, height // 2)
+    y_end = rng.randint(y_start + min_height, height)
+    swap_type = rng.choice(['rgb_to_brg', 'rgb_to_gbr', 'invert_one'])
     if swap_type == 'rgb_to_brg':
         arr[y_start:y_end, :, 0], arr[y_start:y_end, :, 2] = \
             arr[y_start:y_end, :, 2].copy(), arr[y_start:y_end, :, 0].copy()
@@ -88,48 +144,180 @@ def effect_color_channel_swap(arr, intensity, params=None):
         arr[y_start:y_end, :, 1] = arr[y_start:y_end, :, 2]
         arr[y_start:y_end, :, 2] = temp
     else:
-        channel = random.randint(0, 2)
+        channel = rng.randint(0, 2)
         arr[y_start:y_end, :, channel] = 255 - arr[y_start:y_end, :, channel]
     return arr
 
 
-def effect_noise_bands(arr, intensity, params=None):
+def effect_noise_bands(arr, intensity, params=None, rng=None):
     if params is None:
         params = {}
+    if rng is None:
+        rng = random
     height, width = arr.shape[:2]
     num_bands = int(params.get('num_bands', 3) * intensity)
     max_band_height = params.get('max_band_height', 10)
     noise_strength = params.get('noise_strength', 50)
+    np_rng = numpy_rng(rng)
     for _ in range(num_bands):
-        y_start = random.randint(0, height - 10)
-        h = random.randint(2, max(3, int(max_band_height * intensity)))
+        y_start = rng.randint(0, height - 10)
+        h = rng.randint(2, max(3, int(max_band_height * intensity)))
         y_end = min(y_start + h, height)
-        noise = np.random.randint(0, int(noise_strength * intensity), (y_end - y_start, width, 3), dtype=np.int16)
+        noise = np_rng.integers(0, int(noise_strength * intensity), (y_end - y_start, width, 3), dtype=np.int16)
         arr[y_start:y_end, :, :3] = np.clip(arr[y_start:y_end, :, :3].astype(np.int16) + noise, 0, 255).astype(np.uint8)
     return arr
 
 
-def effect_vhs_tracking(arr, intensity, params=None):
-    if params is None:
-        params = {}
-    height = arr.shape[0]
+def _vhs_row_shifts(height, intensity, params, rng):
+    """Losuje przesunięcia wszystkich wierszy dla effect_vhs_tracking."""
     wave_amplitude = int(params.get('wave_amplitude', 10) * intensity)
     wave_freq_min = params.get('wave_freq_min', 0.01)
     wave_freq_max = params.get('wave_freq_max', 0.05)
-    wave_freq = random.uniform(wave_freq_min, wave_freq_max)
-    for y in range(height):
-        shift = int(wave_amplitude * np.sin(y * wave_freq + random.random() * 10))
-        arr[y] = np.roll(arr[y], shift, axis=0)
-    return arr
+    wave_freq = rng.uniform(wave_freq_min, wave_freq_max)
+    phases = numpy_rng(rng).random(height) * 10
+    # Przesunięcia wszystkich wierszy liczone jednym wywołaniem; int() obcina w stronę zera
+    return (wave_amplitude * np.sin(np.arange(height) * wave_freq + phases)).astype(np.intp)
 
 
-def effect_jpeg_artifacts(img, intensity, params=None):
+def effect_vhs_tracking(arr, intensity, params=None, rng=None):
     if params is None:
         params = {}
+    if rng is None:
+        rng = random
+    shifts = _vhs_row_shifts(arr.shape[0], intensity, params, rng)
+    # Wiersze o tym samym przesunięciu przesuwane są razem - najwyżej
+    # 2 * wave_amplitude + 1 operacji zamiast jednej na każdy wiersz
+    # (pełny gather z tablicą indeksów kolumn okazał się wolniejszy na klatkach 4K)
+    for shift in np.unique(shifts):
+        if shift == 0:
+            continue
+        rows = np.flatnonzero(shifts == shift)
+        arr[rows] = np.roll(arr[rows], shift, axis=1)
+    return arr
+
+
+# Standardowe tablice kwantyzacji JPEG (ITU T.81, aneks K) - luminancja i chrominancja
+_JPEG_LUMA_TABLE = np.array([
+    [16, 11, 10, 16, 24, 40, 51, 61],
+    [12, 12, 14, 19, 26, 58, 60, 55],
+    [14, 13, 16, 24, 40, 57, 69, 56],
+    [14, 17, 22, 29, 51, 87, 80, 62],
+    [18, 22, 37, 56, 68, 109, 103, 77],
+    [24, 35, 55, 64, 81, 104, 113, 92],
+    [49, 64, 78, 87, 103, 121, 120, 101],
+    [72, 92, 95, 98, 112, 100, 103, 99],
+], dtype=np.float32)
+_JPEG_CHROMA_TABLE = np.full((8, 8), 99, dtype=np.float32)
+_JPEG_CHROMA_TABLE[:4, :4] = [
+    [17, 18, 24, 47],
+    [18, 21, 26, 66],
+    [24, 26, 56, 99],
+    [47, 66, 99, 99],
+]
+
+
+def _dct_matrix(n=8):
+    """Macierz ortonormalnej transformaty DCT-II o rozmiarze n x n."""
+    k = np.arange(n)
+    matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+_DCT8 = _dct_matrix()
+
+# Konwersja kolorów JFIF (bez przesunięcia 128 dla luminancji, dodawanego osobno)
+_RGB_TO_YCC = np.array([
+    [0.299, 0.587, 0.114],
+    [-0.168736, -0.331264, 0.5],
+    [0.5, -0.418688, -0.081312],
+], dtype=np.float32)
+_YCC_TO_RGB = np.array([
+    [1.0, 0.0, 1.402],
+    [1.0, -0.344136, -0.714136],
+    [1.0, 1.772, 0.0],
+], dtype=np.float32)
+
+
+def _block_transform(blocks, matrix):
+    """Liczy matrix @ b @ matrix.T dla wszystkich bloków 8x8 dwoma dużymi mnożeniami macierzy."""
+    shape = blocks.shape
+    rows = np.ascontiguousarray(blocks).reshape(-1, 8) @ matrix.T
+    cols = rows.reshape(shape).swapaxes(-1, -2).reshape(-1, 8) @ matrix.T
+    return cols.reshape(shape).swapaxes(-1, -2)
+
+_jpeg_local = threading.local()
+
+
+def _jpeg_quality(intensity, params):
     base_quality = params.get('base_quality', 30)
     quality_reduction = params.get('quality_reduction', 5)
-    quality = max(1, int(base_quality - intensity * quality_reduction))
-    buffer = BytesIO()
-    img.save(buffer, format='JPEG', quality=quality)
+    return max(1, int(base_quality - intensity * quality_reduction))
+
+
+def _quant_tables(qualities):
+    """Tablice kwantyzacji (..., 3, 8, 8) przeskalowane jak w libjpeg dla podanych jakości."""
+    q = np.clip(np.asarray(qualities, dtype=np.float32), 1, 100)
+    scale = np.where(q < 50, 5000.0 / q, 200.0 - 2.0 * q)[..., None, None, None]
+    tables = np.stack([_JPEG_LUMA_TABLE, _JPEG_CHROMA_TABLE, _JPEG_CHROMA_TABLE])
+    return np.clip(np.floor((tables * scale + 50) / 100), 1, 255)
+
+
+def _jpeg_dct_simulate(rgb, qualities):
+    """Symuluje kompresję JPEG (DCT 8x8 + kwantyzacja) w czystym numpy.
+    
+    rgb - tablica uint8 (..., H, W, 3), modyfikowana w miejscu; qualities - skalar
+    lub tablica o kształcie wiodących wymiarów (np. (N,) dla wsadu).
+    """
+    height, width = rgb.shape[-3:-1]
+    lead = rgb.shape[:-3]
+    pad_h, pad_w = -height % 8, -width % 8
+    pixels = rgb
+    if pad_h or pad_w:
+        pad = [(0, 0)] * len(lead) + [(0, pad_h), (0, pad_w), (0, 0)]
+        pixels = np.pad(rgb, pad, mode='edge')
+    bh, bw = pixels.shape[-3] // 8, pixels.shape[-2] // 8
+    ycc = pixels.astype(np.float32) @ _RGB_TO_YCC.T
+    ycc[..., 0] -= 128.0
+    # (..., H, W, 3) -> bloki (..., 3, H/8, W/8, 8, 8)
+    blocks = np.moveaxis(ycc.reshape(lead + (bh, 8, bw, 8, 3)), -1, -5).swapaxes(-3, -2)
+    coeffs = _block_transform(blocks, _DCT8)
+    tables = _quant_tables(qualities)[..., :, None, None, :, :]
+    coeffs = np.round(coeffs / tables) * tables
+    blocks = _block_transform(coeffs, _DCT8.T)
+    ycc = np.moveaxis(blocks.swapaxes(-3, -2), -5, -1).reshape(lead + (bh * 8, bw * 8, 3))
+    ycc = ycc[..., :height, :width, :]
+    ycc[..., 0] += 128.0
+    out = ycc @ _YCC_TO_RGB.T
+    np.copyto(rgb, np.clip(np.round(out), 0, 255), casting='unsafe')
+    return rgb
+
+
+def effect_jpeg_artifacts(arr, intensity, params=None, rng=None):
+    """Artefakty kompresji JPEG na kanałach RGB (kanał alfa bez zmian), w miejscu.
+    
+    params['mode'] - 'codec' (domyślnie, prawdziwy koder JPEG z Pillow) lub
+    'dct' (symulacja kwantyzacji DCT w numpy, bez kodeka, wektorowa dla wsadów).
+    """
+    if params is None:
+        params = {}
+    quality = _jpeg_quality(intensity, params)
+    rgb = arr[..., :3]
+    if params.get('mode', 'codec') == 'dct':
+        _jpeg_dct_simulate(rgb, quality)
+        return arr
+    
+    # Bufor kodowania jest wielokrotnie używany w obrębie wątku
+    buffer = getattr(_jpeg_local, 'buffer', None)
+    if buffer is None:
+        buffer = _jpeg_local.buffer = BytesIO()
     buffer.seek(0)
-    return Image.open(buffer).convert('RGB')
\ No newline at end of file
+    buffer.truncate()
+    Image.fromarray(np.ascontiguousarray(rgb)).save(buffer, format='JPEG', quality=quality)
+    buffer.seek(0)
+    decoded = Image.open(buffer)
+    if decoded.mode != 'RGB':
+        decoded = decoded.convert('RGB')
+    # Zdekodowane piksele trafiają bezpośrednio do tablicy wejściowej
+    np.copyto(rgb, np.asarray(decoded))
+    return arr
@@ -0,0 +1,172 @@
+"""
+Background render jobs (cancel, pause/resume, ETA) for Glitch Lab.
+"""
+
+import threading
+import time
+
+from core.processing import process_frames
+
+
+def format_duration(seconds):
+    """Formatuje czas w sekundach jako g:mm:ss albo m:ss."""
+    if seconds is None:
+        return '--:--'
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+class RenderCancelled(Exception):
+    """Render przerwany przez użytkownika (zgłaszany w punkcie kontrolnym)."""
+
+
+class RenderJob:
+    """Render process_frames w wątku w tle, z przerwaniem i pauzą.
+    
+    process_frames wywołuje job.checkpoint(done, total) między klatkami - tam
+    pauza wstrzymuje render, a przerwanie zgłasza RenderCancelled. Każda klatka
+    na dysku jest wtedy kompletna i zapisana w manifeście, więc ponowne
+    uruchomienie z resume=True dokończy render. on_finish(count, error) jest
+    wołane z wątku roboczego po zakończeniu (także po przerwaniu).
+    """
+    
+    PENDING = 'pending'
+    RUNNING = 'running'
+    PAUSED = 'paused'
+    CANCELLING = 'cancelling'
+    CANCELLED = 'cancelled'
+    DONE = 'done'
+    ERROR = 'error'
+    
+    def __init__(self, input_dir, output_dir, multiplier, intensity, enabled_effects,
+                 glitch_enabled=True, anim_params=None, effect_params=None,
+                 progress_callback=None, on_finish=None, **options):
+        self.args = (input_dir, output_dir, multiplier, intensity, enabled_effects,
+                     glitch_enabled, anim_params, effect_params, progress_callback)
+        self.options = options
+        self.on_finish = on_finish
+        self.status = self.PENDING
+        self.result = None
+        self.done = 0
+        self.total = 0
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = None
+        self._first_done = None
+        self._active_time = 0.0
+        self._active_since = None
+    
+    def start(self):
+        """Uruchamia render w wątku w tle."""
+        self.status = self.RUNNING
+        self._active_since = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='glitch-render')
+        self._thread.start()
+        return self
+    
+    def _run(self):
+        try:
+            count, error = process_frames(*self.args, control=self, **self.options)
+            status = self.ERROR if error else self.DONE
+        except RenderCancelled:
+            count, error = self.done, "Render przerwany przez użytkownika"
+            status = self.CANCELLED
+        except Exception as e:
+            count, error = self.done, str(e)
+            status = self.ERROR
+        with self._lock:
+            self._pause_clock()
+            self.result = (count, error)
+            self.status = status
+        if self.on_finish:
+            self.on_finish(count, error)
+    
+    def checkpoint(self, done=None, total=None):
+        """Punkt kontrolny wołany z process_frames między klatkami."""
+        with self._lock:
+            if total is not None:
+                self.total = total
+            if done is not None:
+                if self._first_done is None:
+                    # Przepustowość liczona od pierwszej klatki, bez fazy planowania
+                    self._first_done = done
+                    self._active_time = 0.0
+                    if self._active_since is not None:
+                        self._active_since = time.monotonic()
+                self.done = done
+        if not self._running.is_set():
+            self._running.wait()
+        if self._cancel.is_set():
+            raise RenderCancelled()
+    
+    def cancel(self):
+        """Przerywa render w najbliższym punkcie kontrolnym."""
+        with self._lock:
+            if self.status in (self.RUNNING, self.PAUSED, self.PENDING):
+                self.status = self.CANCELLING
+        self._cancel.set()
+        self._running.set()
+    
+    def pause(self):
+        """Wstrzymuje render w najbliższym punkcie kontrolnym."""
+        with self._lock:
+            if self.status != self.RUNNING:
+                return
+            self._pause_clock()
+            self.status = self.PAUSED
+            self._running.clear()
+    
+    def resume(self):
+        """Wznawia wstrzymany render."""
+        with self._lock:
+            if self.status != self.PAUSED:
+                return
+            self._active_since = time.monotonic()
+            self.status = self.RUNNING
+            self._running.set()
+    
+    def _pause_clock(self):
+        if self._active_since is not None:
+            self._active_time += time.monotonic() - self._active_since
+            self._active_since = None
+    
+    def wait(self, timeout=None):
+        """Czeka na zakończenie renderu; zwraca (count, error) albo None po timeout."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.result
+    
+    @property
+    def finished(self):
+        return self.status in (self.CANCELLED, self.DONE, self.ERROR)
+    
+    @property
+    def elapsed(self):
+        """Czas aktywnego renderu w sekundach (bez pauz)."""
+        with self._lock:
+            active = self._active_time
+            if self._active_since is not None:
+                active += time.monotonic() - self._active_since
+            return active
+    
+    @property
+    def fps(self):
+        """Przepustowość w klatkach na sekundę (bez klatek pominiętych przy wznowieniu)."""
+        elapsed = self.elapsed
+        rendered = self.done - (self._first_done or 0)
+        if elapsed <= 0 or rendered <= 0:
+            return 0.0
+        return rendered / elapsed
+    
+    @property
+    def eta(self):
+        """Szacowany czas do końca w sekundach albo None, gdy brak danych."""
+        fps = self.fps
+        if fps <= 0:
+            return None
+        return max(0, self.total - self.done) / fps
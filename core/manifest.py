@@ -0,0 +1,119 @@
+"""
+Render manifest (per-output-frame completion log) for Glitch Lab.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+
+MANIFEST_NAME = '.glitchlab_manifest.jsonl'
+MANIFEST_GLOB = '.glitchlab_manifest*.jsonl'
+
+
+def manifest_name(frame_range=None):
+    """Nazwa manifestu: wspólna dla pełnego renderu, osobna dla każdej części (start, stop)."""
+    if frame_range is None:
+        return MANIFEST_NAME
+    start, stop = frame_range
+    return f".glitchlab_manifest.{start}-{stop}.jsonl"
+
+
+def seed_from_records(records):
+    """Seed z ostatniej klatki z glitchem spośród wpisów {indeks: wpis} albo None."""
+    for i in sorted(records, reverse=True):
+        if records[i].get('seed') is not None:
+            return records[i]['seed']
+    return None
+
+
+def load_all(output_dir, frame_range=None):
+    """Łączy wpisy wszystkich manifestów w katalogu (pełnego renderu i części).
+
+    Przy tym samym indeksie wygrywa wpis z manifestu zapisanego najpóźniej.
+    frame_range=(start, stop) ogranicza wynik do tego zakresu klatek wyjściowych.
+    """
+    paths = []
+    for path in Path(output_dir).glob(MANIFEST_GLOB):
+        try:
+            paths.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    records = {}
+    for _, path in sorted(paths):
+        for i, record in RenderManifest(path.parent, path.name).load().items():
+            if frame_range is None or frame_range[0] <= i < frame_range[1]:
+                records[i] = record
+    return records
+
+
+def make_record(output_frame_idx, name, source_digest, intensity, seed, plan_digest):
+    """Buduje wpis manifestu dla jednej klatki wyjściowej.
+    
+    Dla klatek kopiowanych bez glitcha intensity, seed i plan_digest są None.
+    """
+    return {
+        'i': output_frame_idx,
+        'name': name,
+        'src': source_digest,
+        'intensity': None if intensity is None else round(float(intensity), 6),
+        'seed': seed,
+        'plan': plan_digest,
+    }
+
+
+class RenderManifest:
+    """Dziennik ukończonych klatek wyjściowych zapisywany w katalogu wyjściowym.
+    
+    Każda linia pliku JSONL opisuje jedną zapisaną klatkę: indeks, nazwę,
+    skrót źródła, efektywną intensywność, seed i skrót planu efektów. Wpis jest
+    dopisywany dopiero po zapisaniu pliku, więc przerwany render zostawia
+    manifest opisujący wyłącznie kompletne klatki.
+    """
+    
+    def __init__(self, output_dir, name=MANIFEST_NAME):
+        self.path = Path(output_dir) / name
+        self._lock = threading.Lock()
+        self._file = None
+    
+    def load(self):
+        """Zwraca słownik {indeks klatki: wpis}; uszkodzone linie są pomijane."""
+        records = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    records[int(record['i'])] = record
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return records
+    
+    def rewrite(self, records):
+        """Zastępuje manifest podanymi wpisami (atomowo) i otwiera go do dopisywania."""
+        self.close()
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in sorted(records, key=lambda r: r['i']):
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.path)
+    
+    def append(self, record):
+        """Dopisuje wpis o ukończonej klatce."""
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self._file.flush()
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def seed(self):
+        """Seed zapisany w manifeście (z ostatniej klatki z glitchem) albo None."""
+        return seed_from_records(self.load())
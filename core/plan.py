@@ -0,0 +1,105 @@
+"""
+Compiled effect chain (render plan) for Glitch Lab.
+"""
+
+import hashlib
+import inspect
+import json
+import numpy as np
+
+from config.effects_registry import EFFECTS, DEFAULT_EFFECT_PARAMS
+
+
+JPEG_MODES = ('codec', 'dct')
+
+
+def _validate_params(effect_key, params):
+    """Sprawdza parametry efektu względem DEFAULT_EFFECT_PARAMS i ujednolica ich typy."""
+    defaults = DEFAULT_EFFECT_PARAMS.get(effect_key, {})
+    # Brakujące parametry uzupełniane wartościami domyślnymi - ten sam łańcuch
+    # zawsze daje ten sam skrót, niezależnie od tego, czy podano domyślne wartości
+    validated = {name: info['value'] for name, info in defaults.items()}
+    for name, value in params.items():
+        info = defaults.get(name)
+        if info is None:
+            validated[name] = value
+            continue
+        if not isinstance(value, (int, float)):
+            raise ValueError(f"Parametr {effect_key}.{name} musi być liczbą, otrzymano: {value!r}")
+        if not info['min'] <= value <= info['max']:
+            raise ValueError(f"Parametr {effect_key}.{name}={value} poza zakresem "
+                             f"[{info['min']}, {info['max']}]")
+        # Suwaki w GUI zwracają float także dla parametrów całkowitych
+        validated[name] = int(round(value)) if isinstance(info['value'], int) else float(value)
+    if effect_key == 'jpeg' and validated.get('mode', 'codec') not in JPEG_MODES:
+        raise ValueError(f"Nieznany tryb jpeg: {validated['mode']!r} (dostępne: {', '.join(JPEG_MODES)})")
+    return validated
+
+
+class RenderPlan:
+    """Łańcuch efektów skompilowany raz z (enabled_effects, effect_params).
+    
+    Funkcje efektów są rozwiązywane z rejestru, parametry walidowane, a bufor
+    roboczy alokowany raz dla znanego rozmiaru klatki. Plan wykonuje się potem
+    dla każdej klatki (apply). Artefakty JPEG są
+    zawsze pierwsze w łańcuchu, pozostałe efekty w kolejności enabled_effects.
+    Plan nie jest przeznaczony do równoczesnego użycia z wielu wątków.
+    """
+    
+    def __init__(self, enabled_effects, effect_params=None):
+        if effect_params is None:
+            effect_params = {}
+        self.enabled_effects = list(enabled_effects)
+        
+        ordered = [key for key in self.enabled_effects if key == 'jpeg']
+        ordered += [key for key in self.enabled_effects if key != 'jpeg']
+        self.steps = []
+        for effect_key in ordered:
+            if effect_key not in EFFECTS:
+                continue
+            _, effect_func = EFFECTS[effect_key]
+            if not effect_func:
+                continue
+            params = _validate_params(effect_key, effect_params.get(effect_key, {}))
+            takes_scratch = 'scratch' in inspect.signature(effect_func).parameters
+            self.steps.append((effect_key, effect_func, params, takes_scratch))
+        
+        self.effect_params = {key: params for key, _, params, _ in self.steps}
+        self._scratch = None
+    
+    def __bool__(self):
+        return bool(self.steps)
+    
+    def __getstate__(self):
+        # Bufor roboczy nie jest przesyłany do procesów roboczych
+        state = self.__dict__.copy()
+        state['_scratch'] = None
+        return state
+    
+    @property
+    def effect_keys(self):
+        """Klucze efektów w kolejności wykonywania."""
+        return [key for key, _, _, _ in self.steps]
+    
+    @property
+    def digest(self):
+        """Stabilny skrót łańcucha efektów i ich parametrów."""
+        payload = json.dumps([[key, params] for key, _, params, _ in self.steps], sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def prepare(self, shape, dtype=np.uint8):
+        """Alokuje bufor roboczy dla klatek o podanym kształcie."""
+        size = int(np.prod(shape))
+        if self._scratch is None or self._scratch.size < size or self._scratch.dtype != dtype:
+            self._scratch = np.empty(size, dtype=dtype)
+        return self._scratch
+    
+    def apply(self, arr, intensity, rng=None):
+        """Wykonuje łańcuch efektów na tablicy klatki (H, W, C) i zwraca wynik."""
+        scratch = self.prepare(arr.shape, arr.dtype)
+        for _, effect_func, params, takes_scratch in self.steps:
+            if takes_scratch:
+                arr = effect_func(arr, intensity, params, rng, scratch=scratch)
+            else:
+                arr = effect_func(arr, intensity, params, rng)
+        return arr
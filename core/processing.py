@@ -2,7 +2,11 @@
 Frame processing functions for Glitch Lab.
 """
 
+import os
 import shutil
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 
@@ -12,101 +16,256 @@ try:
 except ImportError:
     PIL_AVAILABLE = False
 
-from core.utils import get_frame_info
+from core.utils import get_frame_info, frame_rng, new_render_seed, file_digest
 from core.animation import calculate_glitch_intensity
-from core.effects import effect_jpeg_artifacts
-from config.effects_registry import EFFECTS
+from core.plan import RenderPlan
+from core.manifest import RenderManifest, make_record, manifest_name, load_all, seed_from_records
+from core.cache import cache_key
 
 
-def apply_glitch(file_path, intensity, enabled_effects, effect_params=None):
-    """Aplikuje efekty glitch do obrazu."""
-    if not PIL_AVAILABLE:
-        return False
-    if effect_params is None:
-        effect_params = {}
-    
-    img = Image.open(file_path)
+def image_to_array(img):
+    """Konwertuje PIL Image na tablicę klatki. Zwraca (arr, has_alpha)."""
     if img.mode == 'RGBA':
-        arr = np.array(img)
-        has_alpha = True
-    else:
-        img = img.convert('RGB')
-        arr = np.array(img)
-        has_alpha = False
-    
-    if 'jpeg' in enabled_effects:
-        params = effect_params.get('jpeg', {})
-        if has_alpha:
-            rgb_img = Image.fromarray(arr[:, :, :3])
-            rgb_img = effect_jpeg_artifacts(rgb_img, intensity, params)
-            arr[:, :, :3] = np.array(rgb_img)
-        else:
-            img = Image.fromarray(arr)
-            img = effect_jpeg_artifacts(img, intensity, params)
-            arr = np.array(img)
+        return np.array(img), True
+    return np.array(img.convert('RGB')), False
+
+
+def array_to_image(arr, has_alpha):
+    """Konwertuje tablicę klatki z powrotem na PIL Image."""
+    if has_alpha:
+        return Image.fromarray(arr, 'RGBA')
+    return Image.fromarray(arr)
+
+
+def load_frame_array(file_path):
+    """Wczytuje klatkę z dysku jako tablicę numpy. Zwraca (arr, has_alpha)."""
+    return image_to_array(Image.open(file_path))
+
+
+def save_frame_array(arr, file_path, has_alpha):
+    """Zapisuje tablicę klatki na dysk (format wg rozszerzenia pliku)."""
+    array_to_image(arr, has_alpha).save(file_path)
+
+
+def _as_plan(enabled_effects, effect_params=None):
+    """Zwraca RenderPlan - gotowy plan przechodzi bez zmian, lista efektów jest kompilowana."""
+    if isinstance(enabled_effects, RenderPlan):
+        return enabled_effects
+    return RenderPlan(enabled_effects, effect_params)
+
+
+def glitch_array(arr, intensity, enabled_effects, effect_params=None, rng=None):
+    """Silnik glitcha: tablica klatki (H, W, C) na wejściu, wynikowa tablica na wyjściu.
     
-    for effect_key in enabled_effects:
-        if effect_key == 'jpeg':
-            continue
-        if effect_key in EFFECTS:
-            _, effect_func = EFFECTS[effect_key]
-            if effect_func:
-                params = effect_params.get(effect_key, {})
-                arr = effect_func(arr, intensity, params)
+    Wszystkie ścieżki (render wsadowy, podgląd w GUI, apply_glitch) przechodzą
+    przez tę funkcję; dekodowanie i zapis plików są warstwą wokół niej.
+    enabled_effects może być listą kluczy efektów albo skompilowanym RenderPlan.
+    """
+    return _as_plan(enabled_effects, effect_params).apply(arr, intensity, rng)
+
+
+def apply_glitch(file_path, intensity, enabled_effects, effect_params=None, rng=None, dest_path=None):
+    """Aplikuje efekty glitch do pliku obrazu (dekodowanie → glitch_array → zapis).
     
-    if has_alpha:
-        result = Image.fromarray(arr, 'RGBA')
-    else:
-        result = Image.fromarray(arr)
-    result.save(file_path)
+    rng - generator losowy przekazywany do efektów (patrz core.utils.frame_rng).
+    dest_path - plik docelowy; domyślnie wynik nadpisuje file_path.
+    """
+    if not PIL_AVAILABLE:
+        return False
+    
+    arr, has_alpha = load_frame_array(file_path)
+    arr = glitch_array(arr, intensity, enabled_effects, effect_params, rng)
+    save_frame_array(arr, dest_path if dest_path is not None else file_path, has_alpha)
     return True
 
 
-def apply_glitch_to_image(img, intensity, enabled_effects, effect_params=None):
-    """Aplikuje efekty glitch do PIL Image (bez zapisu)."""
-    if effect_params is None:
-        effect_params = {}
+def apply_glitch_to_image(img, intensity, enabled_effects, effect_params=None, rng=None):
+    """Aplikuje efekty glitch do PIL Image (bez zapisu) - używane przez podgląd w GUI."""
+    arr, has_alpha = image_to_array(img)
+    arr = glitch_array(arr, intensity, enabled_effects, effect_params, rng)
+    return array_to_image(arr, has_alpha)
+
+
+_worker_plans = {}
+
+
+def _shared_plan(plan):
+    """Zwraca jedną instancję planu na proces (po skrócie), aby bufory robocze
+    nie były alokowane od nowa dla każdego zadania przesłanego do puli."""
+    return _worker_plans.setdefault(plan.digest, plan)
+
+
+def _render_source_frame(job, on_output=None):
+    """Renderuje wszystkie klatki wyjściowe powstające z jednej klatki źródłowej.
     
-    if img.mode == 'RGBA':
-        arr = np.array(img)
-        has_alpha = True
-    else:
-        img = img.convert('RGB')
-        arr = np.array(img)
-        has_alpha = False
-    
-    if 'jpeg' in enabled_effects:
-        params = effect_params.get('jpeg', {})
-        if has_alpha:
-            rgb_img = Image.fromarray(arr[:, :, :3])
-            rgb_img = effect_jpeg_artifacts(rgb_img, intensity, params)
-            arr[:, :, :3] = np.array(rgb_img)
+    Źródło jest dekodowane najwyżej raz (tylko gdy któraś kopia dostaje glitch);
+    każdy wariant dostaje tanią kopię zdekodowanej tablicy we wspólnym buforze,
+    a ostatni wariant przejmuje samą zdekodowaną tablicę. Klatki bez glitcha są
+    kopiowane bajtowo bez dekodowania. on_output(output_frame_idx) wywoływane po
+    zapisie każdej kopii.
+    """
+    file_path, outputs, plan, seed = job
+    plan = _shared_plan(plan)
+    glitched = [k for k, (_, frame_intensity, _) in enumerate(outputs) if frame_intensity is not None]
+    source = None
+    variant = None
+    has_alpha = False
+    if glitched:
+        source, has_alpha = load_frame_array(file_path)
+    
+    for k, (dest_path, frame_intensity, output_frame_idx) in enumerate(outputs):
+        if frame_intensity is None:
+            shutil.copy2(file_path, dest_path)
         else:
-            pil_img = Image.fromarray(arr)
-            pil_img = effect_jpeg_artifacts(pil_img, intensity, params)
-            arr = np.array(pil_img)
+            if k == glitched[-1]:
+                arr = source
+            else:
+                if variant is None:
+                    variant = np.empty_like(source)
+                np.copyto(variant, source)
+                arr = variant
+            arr = glitch_array(arr, frame_intensity, plan, rng=frame_rng(seed, output_frame_idx))
+            save_frame_array(arr, dest_path, has_alpha)
+        if on_output:
+            on_output(output_frame_idx)
+    return len(outputs)
+
+
+def _read_source(job):
+    """Etap odczytu: dekoduje źródło tylko jeśli któraś z jego kopii dostaje glitch."""
+    file_path, outputs, _, _ = job
+    if any(frame_intensity is not None for _, frame_intensity, _ in outputs):
+        return load_frame_array(file_path)
+    return None, False
+
+
+def _render_streaming(jobs, on_output, prefetch=4, write_queue=8, io_threads=2):
+    """Trzyetapowy potok: odczyt z wyprzedzeniem → efekty → zapis w tle.
     
-    for effect_key in enabled_effects:
-        if effect_key == 'jpeg':
-            continue
-        if effect_key in EFFECTS:
-            _, effect_func = EFFECTS[effect_key]
-            if effect_func:
-                params = effect_params.get(effect_key, {})
-                arr = effect_func(arr, intensity, params)
+    Wątki odczytu dekodują do prefetch klatek źródłowych naprzód, efekty liczone
+    są w bieżącym wątku, a kodowanie i zapis trafiają do wątków zapisu z kolejką
+    o głębokości write_queue - pamięć jest ograniczona niezależnie od długości
+    sekwencji, a I/O nakłada się z obliczeniami. on_output(output_frame_idx) wywoływane jest
+    w kolejności klatek wyjściowych, po faktycznym zapisie pliku.
+    """
+    readers = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix='glitch-read')
+    writers = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix='glitch-write')
+    reads = deque()
+    writes = deque()
+    next_read = 0
     
-    if has_alpha:
-        return Image.fromarray(arr, 'RGBA')
-    return Image.fromarray(arr)
+    def drain(limit):
+        while len(writes) > limit:
+            future, output_frame_idx = writes.popleft()
+            future.result()
+            on_output(output_frame_idx)
+    
+    try:
+        for file_path, outputs, plan, seed in jobs:
+            while next_read < len(jobs) and len(reads) <= prefetch:
+                reads.append(readers.submit(_read_source, jobs[next_read]))
+                next_read += 1
+            source, has_alpha = reads.popleft().result()
+            glitched = [k for k, (_, frame_intensity, _) in enumerate(outputs) if frame_intensity is not None]
+            
+            for k, (dest_path, frame_intensity, output_frame_idx) in enumerate(outputs):
+                if frame_intensity is None:
+                    future = writers.submit(shutil.copy2, file_path, dest_path)
+                else:
+                    # Tablica trafia do kolejki zapisu, więc każdy wariant poza
+                    # ostatnim dostaje własną kopię źródła
+                    arr = source if k == glitched[-1] else source.copy()
+                    arr = glitch_array(arr, frame_intensity, plan, rng=frame_rng(seed, output_frame_idx))
+                    future = writers.submit(save_frame_array, arr, dest_path, has_alpha)
+                writes.append((future, output_frame_idx))
+                drain(write_queue)
+        drain(0)
+    finally:
+        readers.shutdown(wait=True, cancel_futures=True)
+        writers.shutdown(wait=True)
+
+
+def shard_output_range(total_input, multiplier, shard):
+    """Zakres (start, stop) indeksów klatek wyjściowych części shard=(indeks, liczba części).
+    
+    Granice są wyrównane do klatek źródłowych, więc każde źródło jest
+    dekodowane tylko na jednej maszynie.
+    """
+    index, count = shard
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Nieprawidłowa część renderu: {index}/{count} (indeks od 0 do {count - 1})")
+    first = total_input * index // count
+    last = total_input * (index + 1) // count
+    return first * multiplier, last * multiplier
+
+
+def _default_workers():
+    """Domyślna liczba procesów roboczych (liczba rdzeni CPU)."""
+    return os.cpu_count() or 1
+
+
+def _source_digests(paths, threads, control=None):
+    """Skróty plików źródłowych liczone równolegle w wątkach I/O -> {ścieżka: skrót}."""
+    digests = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix='glitch-digest')
+    try:
+        for file_path, digest in zip(paths, executor.map(file_digest, paths)):
+            if control is not None:
+                control.checkpoint()
+            digests[file_path] = digest
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return digests
 
 
 def process_frames(input_dir, output_dir, multiplier, intensity, enabled_effects, 
-                   glitch_enabled=True, anim_params=None, effect_params=None, progress_callback=None):
-    """Przetwarza klatki z efektami glitch."""
+                   glitch_enabled=True, anim_params=None, effect_params=None, progress_callback=None,
+                   workers=None, seed=None, prefetch=4, write_queue=8, io_threads=2,
+                   resume=True, cache=None, control=None, shard=None, frame_range=None):
+    """Przetwarza klatki z efektami glitch.
+    
+    workers - liczba procesów roboczych (domyślnie liczba rdzeni CPU).
+    Przy workers == 1 efekty liczone są w bieżącym wątku, a odczyt i zapis
+    plików odbywają się w tle (patrz prefetch / write_queue).
+    seed - seed renderu; każda klatka wyjściowa dostaje własny generator
+    wyprowadzony z (seed, indeks klatki), więc wynik nie zależy od kolejności
+    ani liczby procesów. Przy seed=None losowany jest nowy seed.
+    prefetch, write_queue, io_threads - parametry potoku strumieniowego używanego
+    przy workers == 1: liczba klatek źródłowych dekodowanych z wyprzedzeniem,
+    głębokość kolejki zapisu i liczba wątków I/O. prefetch=0 wyłącza potok.
+    resume - render przyrostowy / wznawianie: w katalogu wyjściowym prowadzony jest
+    manifest ukończonych klatek (core.manifest); klatki, których wpis zgadza się
+    ze źródłem, intensywnością, seedem i planem efektów, a plik istnieje, są
+    pomijane. Po zmianie klatek kluczowych lub parametrów przeliczane są więc
+    tylko klatki, których intensywność lub łańcuch efektów faktycznie się zmienił,
+    a klatki z poprzedniego renderu spoza nowego planu są usuwane. Przy seed=None
+    przejmowany jest seed zapisany w manifeście.
+    Skróty plików źródłowych (do manifestu i cache) liczone są tylko przy
+    resume albo cache, równolegle w io_threads wątkach.
+    cache - opcjonalny core.cache.RenderCache; klatki z glitchem, których klucz
+    (źródło, plan, intensywność, seed i indeks klatki) jest w cache, są kopiowane
+    z cache zamiast liczone, a nowo wyrenderowane trafiają do cache. Cache jest
+    pomijany, gdy seed nie jest trwały (resume=False i seed=None).
+    control - opcjonalny obiekt z metodą checkpoint(done=None, total=None)
+    (np. core.jobs.RenderJob), wołaną między klatkami; może wstrzymać render
+    albo go przerwać wyjątkiem, który process_frames przepuszcza dalej.
+    shard, frame_range - render tylko części sekwencji: shard=(indeks, liczba części)
+    albo frame_range=(start, stop) indeksów klatek wyjściowych. Numeracja,
+    krzywa intensywności i generatory klatek pozostają globalne, więc części
+    renderowane na różnych maszynach do wspólnego katalogu dają ten sam wynik
+    co jeden render. Każda część prowadzi własny manifest; wymagany jest seed
+    (podany albo zapisany w manifestach katalogu wyjściowego).
+    """
     if anim_params is None:
         anim_params = {'pattern_mode': 'every', 'intensity_mode': 'constant'}
     if effect_params is None:
         effect_params = {}
+    if workers is None:
+        workers = _default_workers()
+    try:
+        plan = RenderPlan(enabled_effects, effect_params)
+    except ValueError as e:
+        return 0, str(e)
     
     input_path = Path(input_dir)
     output_path = Path(output_dir)
@@ -130,49 +289,181 @@ def process_frames(input_dir, output_dir, multiplier, intensity, enabled_effects
     total_output = total_input * multiplier
     _, _, (prefix, padding), _ = frames[0]
     
+    # Zakres klatek wyjściowych tego renderu (cała sekwencja albo jedna część)
+    range_start, range_stop = 0, total_output
+    try:
+        if shard is not None:
+            range_start, range_stop = shard_output_range(total_input, multiplier, shard)
+        elif frame_range is not None:
+            range_start, range_stop = frame_range[0], min(frame_range[1], total_output)
+            if not 0 <= range_start < range_stop:
+                raise ValueError(f"Nieprawidłowy zakres klatek wyjściowych: {frame_range[0]}-{frame_range[1]} "
+                                 f"(sekwencja ma {total_output} klatek)")
+    except ValueError as e:
+        return 0, str(e)
+    partial = shard is not None or frame_range is not None
+    planned_total = range_stop - range_start
+    
+    manifest = RenderManifest(output_path, manifest_name((range_start, range_stop) if partial else None))
+    # Wpisy wszystkich manifestów katalogu (także innych części); pełny render
+    # bierze wszystkie, aby usunąć klatki spoza nowego planu
+    previous = load_all(output_path, (range_start, range_stop) if partial else None) if resume else {}
+    if seed is None and (resume or partial):
+        seed = seed_from_records(load_all(output_path))
+    if seed is None:
+        if partial:
+            return 0, "Render części sekwencji wymaga podania seeda (wspólnego dla wszystkich części)."
+        seed = new_render_seed()
+        if not resume:
+            # Pełny render bez seeda losuje go za każdym razem - wpisy cache nie
+            # mogłyby zostać trafione, więc klatki nie są do niego kopiowane
+            cache = None
+    
     if progress_callback:
         progress_callback(f"Znaleziono {total_input} klatek, generowanie {total_output} klatek...")
+        if partial:
+            progress_callback(f"Część renderu: klatki wyjściowe {range_start}-{range_stop - 1} "
+                              f"({planned_total} z {total_output})")
+        progress_callback(f"Seed: {seed}")
     
-    new_frame_num = 0
-    output_frame_idx = 0
+    # Skróty źródeł są potrzebne tylko do porównania z manifestem i do kluczy cache;
+    # przy pełnym renderze bez cache wpisy manifestu nie mają skrótu (src=None)
+    digests = {}
+    if resume or cache is not None:
+        sources = [file_path for i, (_, _, _, file_path) in enumerate(frames)
+                   if range_start < (i + 1) * multiplier and i * multiplier < range_stop]
+        if progress_callback:
+            progress_callback(f"Obliczanie skrótów {len(sources)} klatek źródłowych...")
+        digests = _source_digests(sources, io_threads, control)
     
+    # Zaplanuj wszystkie klatki wyjściowe (kolejność i intensywność liczone
+    # w procesie głównym, aby numeracja była identyczna jak w trybie szeregowym)
+    jobs = []
+    pending = {}
+    skipped = []
+    cached = []
+    output_frame_idx = 0
     for i, (frame_num, ext, meta, file_path) in enumerate(frames):
+        if control is not None:
+            control.checkpoint()
+        outputs = []
+        if not (range_start < output_frame_idx + multiplier and output_frame_idx < range_stop):
+            # Źródło w całości poza zakresem tej części
+            output_frame_idx += multiplier
+            continue
+        source_digest = digests.get(file_path)
         for j in range(multiplier):
-            new_name = f"{prefix}{str(new_frame_num).zfill(padding)}.{ext}"
+            if not range_start <= output_frame_idx < range_stop:
+                output_frame_idx += 1
+                continue
+            new_name = f"{prefix}{str(output_frame_idx).zfill(padding)}.{ext}"
             dest_path = output_path / new_name
-            shutil.copy2(file_path, dest_path)
+            message = f"Przetwarzanie klatki {i + 1}/{total_input}: {file_path.name} → {new_name}"
+            frame_intensity = None
             
-            can_glitch = glitch_enabled and enabled_effects and (j > 0 or multiplier == 1)
+            can_glitch = glitch_enabled and plan and (j > 0 or multiplier == 1)
             if can_glitch:
-                should_glitch, frame_intensity = calculate_glitch_intensity(
-                    output_frame_idx, total_output, intensity, anim_params
+                should_glitch, glitch_intensity = calculate_glitch_intensity(
+                    output_frame_idx, total_output, intensity, anim_params,
+                    frame_rng(seed, output_frame_idx, 'anim')
                 )
-                if should_glitch and frame_intensity > 0:
-                    if progress_callback:
-                        progress_callback(f"Przetwarzanie klatki {i + 1}/{total_input}: {file_path.name} → {new_name} (glitch)")
-                    apply_glitch(dest_path, frame_intensity, enabled_effects, effect_params)
-                else:
-                    if progress_callback:
-                        progress_callback(f"Przetwarzanie klatki {i + 1}/{total_input}: {file_path.name} → {new_name}")
-            else:
-                if progress_callback:
-                    progress_callback(f"Przetwarzanie klatki {i + 1}/{total_input}: {file_path.name} → {new_name}")
+                if should_glitch and glitch_intensity > 0:
+                    frame_intensity = glitch_intensity
+                    message += " (glitch)"
             
-            new_frame_num += 1
+            glitched = frame_intensity is not None
+            record = make_record(output_frame_idx, new_name, source_digest, frame_intensity,
+                                 seed if glitched else None, plan.digest if glitched else None)
+            key = None
+            if cache is not None and glitched:
+                key = cache_key(source_digest, plan.digest, frame_intensity, seed, output_frame_idx)
+            if previous.get(output_frame_idx) == record and dest_path.exists():
+                skipped.append(record)
+            elif key is not None and cache.fetch(key, dest_path):
+                cached.append(output_frame_idx)
+                pending[output_frame_idx] = (i, message + " (cache)", record, dest_path, None)
+            else:
+                outputs.append((dest_path, frame_intensity, output_frame_idx))
+                pending[output_frame_idx] = (i, message, record, dest_path, key)
             output_frame_idx += 1
-            
-            # Aktualizuj pasek postępu częściej - po każdej wygenerowanej klatce
-            if progress_callback:
-                current_progress = round(output_frame_idx / total_output * 100)
-                progress_callback(current_progress)
-        
+        if outputs:
+            jobs.append((file_path, outputs, plan, seed))
+    
+    # Klatki poprzedniego renderu, których nazwa nie występuje w nowym planie
+    # (mniej klatek źródłowych, mniejszy mnożnik), są nieaktualne
+    planned_names = {record['name'] for record in skipped}
+    planned_names.update(record['name'] for _, _, record, _, _ in pending.values())
+    stale = 0
+    for record in previous.values():
+        name = Path(str(record.get('name', ''))).name
+        if name and name not in planned_names and (output_path / name).is_file():
+            (output_path / name).unlink()
+            stale += 1
+    
+    # Manifest zawiera odtąd tylko wpisy nadal aktualne; nowe są dopisywane po zapisie klatek
+    manifest.rewrite(skipped)
+    done = len(skipped)
+    if previous and progress_callback:
+        progress_callback(f"Render przyrostowy: {len(skipped)} klatek bez zmian, "
+                          f"{planned_total - len(skipped)} do przeliczenia")
+        if stale:
+            progress_callback(f"Usunięto {stale} nieaktualnych klatek poprzedniego renderu")
+        progress_callback(round(done / planned_total * 100))
+    if cached and progress_callback:
+        progress_callback(f"Cache: {len(cached)} klatek skopiowanych bez renderowania")
+    if control is not None:
+        control.checkpoint(done, planned_total)
+    
+    def report_output(output_frame_idx):
+        nonlocal done
+        i, message, record, dest_path, key = pending[output_frame_idx]
+        if key is not None:
+            cache.store(key, dest_path)
+        manifest.append(record)
+        done += 1
+        if control is not None:
+            control.checkpoint(done, planned_total)
+        if not progress_callback:
+            return
+        progress_callback(message)
+        # Aktualizuj pasek postępu częściej - po każdej wygenerowanej klatce
+        progress_callback(round(done / planned_total * 100))
         # Dodatkowa aktualizacja po zakończeniu przetwarzania każdej klatki wejściowej
-        if progress_callback:
-            overall_progress = round((i + 1) / total_input * 100)
-            # Nie duplikuj aktualizacji jeśli multiplier == 1
-            if multiplier == 1:
-                pass  # Już zaktualizowane powyżej
-            else:
-                progress_callback(overall_progress)
+        if multiplier > 1 and output_frame_idx % multiplier == multiplier - 1:
+            progress_callback(min(100, round(((i + 1) * multiplier - range_start) / planned_total * 100)))
+    
+    def report_task(task):
+        for _, _, output_frame_idx in task[1]:
+            report_output(output_frame_idx)
+    
+    try:
+        for cached_idx in cached:
+            report_output(cached_idx)
+        if workers > 1 and len(jobs) > 1:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                           mp_context=multiprocessing.get_context('spawn'))
+            try:
+                # Zadania są zlecane oknem o ograniczonej długości i odbierane w
+                # kolejności klatek źródłowych - pauza lub przerwanie w punkcie
+                # kontrolnym wstrzymuje też zlecanie kolejnych zadań
+                window = workers * 2
+                in_flight = deque()
+                next_task = 0
+                while next_task < len(jobs) or in_flight:
+                    while next_task < len(jobs) and len(in_flight) < window:
+                        in_flight.append((jobs[next_task], executor.submit(_render_source_frame, jobs[next_task])))
+                        next_task += 1
+                    task, future = in_flight.popleft()
+                    future.result()
+                    report_task(task)
+            finally:
+                executor.shutdown(cancel_futures=True)
+        elif prefetch > 0:
+            _render_streaming(jobs, report_output, prefetch, write_queue, io_threads)
+        else:
+            for job in jobs:
+                _render_source_frame(job, report_output)
+    finally:
+        manifest.close()
     
-    return new_frame_num, None
\ No newline at end of file
+    return planned_total, None
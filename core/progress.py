@@ -0,0 +1,43 @@
+"""
+Thread-safe progress channel between render threads and the UI for Glitch Lab.
+"""
+
+import threading
+from collections import deque
+
+
+class ProgressChannel:
+    """Kanał postępu: wątek renderu zapisuje, wątek UI odbiera w stałym rytmie.
+    
+    Instancja jest zgodna z progress_callback z process_frames: komunikat (str)
+    trafia do ograniczonej kolejki, a wartość procentowa nadpisuje poprzednią,
+    więc wywołanie nigdy nie blokuje renderu na UI. drain() zwraca wszystko,
+    co zebrało się od ostatniego odbioru; przy przepełnieniu najstarsze
+    komunikaty są odrzucane i tylko liczone.
+    """
+    
+    def __init__(self, max_messages=1000):
+        self.max_messages = max_messages
+        self._lock = threading.Lock()
+        self._messages = deque()
+        self._percent = None
+        self._dropped = 0
+    
+    def __call__(self, value):
+        with self._lock:
+            if isinstance(value, str):
+                if len(self._messages) >= self.max_messages:
+                    self._messages.popleft()
+                    self._dropped += 1
+                self._messages.append(value)
+            else:
+                self._percent = value
+    
+    def drain(self):
+        """Zwraca (ostatni procent albo None, lista komunikatów, liczba odrzuconych)."""
+        with self._lock:
+            percent, self._percent = self._percent, None
+            messages = list(self._messages)
+            self._messages.clear()
+            dropped, self._dropped = self._dropped, 0
+        return percent, messages, dropped
@@ -4,6 +4,8 @@ Utility functions for Glitch Lab.
 
 import os
 import re
+import random
+import hashlib
 
 
 def get_frame_info(filename):
@@ -18,4 +20,27 @@ def get_frame_info(filename):
         frame_num = int(match.group(2))
         padding = len(match.group(2))
         return frame_num, ext, (prefix, padding)
-    return None, None, None
\ No newline at end of file
+    return None, None, None
+
+
+def file_digest(file_path, chunk_size=1 << 20):
+    """Skrót zawartości pliku (BLAKE2b, 128 bitów) w postaci szesnastkowej."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def new_render_seed():
+    """Losuje seed renderu (używany gdy użytkownik nie podał własnego)."""
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+def frame_rng(seed, frame_idx, stream='effects'):
+    """Zwraca deterministyczny generator dla danej klatki wyjściowej.
+    
+    Generator zależy tylko od (seed, stream, frame_idx), więc każdą klatkę
+    można przeliczyć niezależnie - w dowolnej kolejności i na dowolnym procesie.
+    """
+    return random.Random(f"{seed}:{stream}:{frame_idx}")
@@ -0,0 +1,203 @@
+"""
+Lazy, windowed frame source for the preview players.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+def decode_frame(path):
+    """Dekoduje pełną klatkę z pliku."""
+    img = Image.open(path)
+    img.load()
+    return img
+
+
+def image_nbytes(img):
+    """Przybliżony rozmiar zdekodowanego obrazu w pamięci (bajty)."""
+    return img.width * img.height * len(img.getbands())
+
+
+class LazyFrameSource:
+    """Sekwencja klatek dekodowanych na żądanie, z ograniczonym oknem LRU.
+    
+    Przechowuje tylko ścieżki; source[idx] dekoduje klatkę (albo czeka na
+    trwające dekodowanie w tle) i trzyma ją w oknie najwyżej window klatek
+    i max_bytes bajtów. prefetch(idx, direction) dekoduje w tle kolejne klatki
+    w kierunku odtwarzania. Zachowuje się jak lista (len, indeksowanie,
+    wartość logiczna), więc zastępuje dawne listy obrazów PreviewPlayera.
+    """
+    
+    def __init__(self, paths, loader=decode_frame, window=32, max_bytes=768 * 1024 ** 2,
+                 prefetch=8, executor=None):
+        self.paths = list(paths)
+        self.loader = loader
+        self.window = max(1, window)
+        self.max_bytes = max_bytes
+        self.prefetch_count = prefetch
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._bytes = 0
+        self._pending = {}
+        self._executor = executor
+    
+    def __len__(self):
+        return len(self.paths)
+    
+    def __bool__(self):
+        return bool(self.paths)
+    
+    def __iter__(self):
+        for idx in range(len(self.paths)):
+            yield self[idx]
+    
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self.paths)
+        if not 0 <= idx < len(self.paths):
+            raise IndexError(idx)
+        with self._lock:
+            img = self._cache.get(idx)
+            if img is not None:
+                self._cache.move_to_end(idx)
+                return img
+            future = self._pending.get(idx)
+        if future is not None:
+            if not future.cancel():
+                # Dekodowanie już trwa - poczekaj na nie
+                return future.result()
+            # Zlecenie jeszcze czekało w kolejce - dekoduj od razu zamiast czekać
+            with self._lock:
+                self._pending.pop(idx, None)
+        img = self.loader(self.paths[idx])
+        self._store(idx, img)
+        return img
+    
+    def extend(self, paths):
+        """Dołącza kolejne ścieżki (klatki doładowywane w trakcie odtwarzania)."""
+        with self._lock:
+            self.paths.extend(paths)
+    
+    def cached(self, idx):
+        """Klatka z okna albo None, bez dekodowania."""
+        with self._lock:
+            return self._cache.get(idx)
+    
+    def _store(self, idx, img):
+        with self._lock:
+            if idx in self._cache:
+                return
+            self._cache[idx] = img
+            self._bytes += image_nbytes(img)
+            # Zawsze zostaje przynajmniej właśnie dodana klatka
+            while len(self._cache) > 1 and (len(self._cache) > self.window or self._bytes > self.max_bytes):
+                _, old = self._cache.popitem(last=False)
+                self._bytes -= image_nbytes(old)
+    
+    def _load_async(self, idx):
+        try:
+            img = self.loader(self.paths[idx])
+            self._store(idx, img)
+            return img
+        finally:
+            with self._lock:
+                self._pending.pop(idx, None)
+    
+    def prefetch(self, idx, direction=1):
+        """Zleca dekodowanie w tle kolejnych klatek od idx w kierunku direction (z zawijaniem).
+        
+        Oczekujące zlecenia spoza nowego okna są anulowane, więc w kolejce jest
+        najwyżej prefetch klatek, także przy szybkim przewijaniu.
+        """
+        count = min(self.prefetch_count, self.window - 1, len(self.paths) - 1)
+        targets = [(idx + step * direction) % len(self.paths) for step in range(1, count + 1)] if count > 0 else []
+        with self._lock:
+            for target, future in list(self._pending.items()):
+                if target not in targets and future.cancel():
+                    del self._pending[target]
+            if not targets:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='preview-decode')
+            for target in targets:
+                if target in self._cache or target in self._pending:
+                    continue
+                self._pending[target] = self._executor.submit(self._load_async, target)
+    
+    def cancel_pending(self):
+        """Anuluje oczekujące dekodowania (np. przed zastąpieniem źródła nowym)."""
+        with self._lock:
+            for target, future in list(self._pending.items()):
+                if future.cancel():
+                    del self._pending[target]
+    
+    def clear(self):
+        """Zwalnia zdekodowane klatki (ścieżki zostają)."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+
+class PyramidCache:
+    """Piramidy mipmap klatek dla podglądu z zoomem, z oknem LRU.
+    
+    Poziom k piramidy to klatka zmniejszona 2^k razy; poziomy powstają leniwie,
+    dopiero gdy zoom ich wymaga, każdy z poprzedniego (filtr BOX). Poziom 0
+    to sam obraz z LazyFrameSource i nie jest tu przechowywany. level_for
+    zwraca najmniejszy poziom nie mniejszy niż żądana skala, więc końcowe
+    skalowanie zawsze zmniejsza obraz najwyżej dwukrotnie.
+    """
+    
+    def __init__(self, window=16, max_bytes=256 * 1024 ** 2):
+        self.window = max(1, window)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._levels = OrderedDict()
+        self._bytes = 0
+    
+    def level_for(self, key, img, scale):
+        """Poziom piramidy dla skali scale -> (obraz poziomu, jego skala względem img)."""
+        with self._lock:
+            levels = self._levels.get(key)
+            if levels is not None:
+                self._levels.move_to_end(key)
+        levels = list(levels or [])
+        built = len(levels)
+        
+        level_img = img
+        depth = 0
+        while scale <= 0.5 ** (depth + 1) and level_img.width >= 2 and level_img.height >= 2:
+            if depth < len(levels):
+                level_img = levels[depth]
+            else:
+                level_img = level_img.resize((level_img.width // 2, level_img.height // 2), Image.Resampling.BOX)
+                levels.append(level_img)
+            depth += 1
+        
+        if len(levels) > built:
+            self._store(key, levels)
+        return level_img, level_img.width / img.width
+    
+    def _store(self, key, levels):
+        with self._lock:
+            old = self._levels.pop(key, None)
+            if old is not None:
+                self._bytes -= sum(image_nbytes(level) for level in old)
+            self._levels[key] = levels
+            self._bytes += sum(image_nbytes(level) for level in levels)
+            while len(self._levels) > 1 and (len(self._levels) > self.window or self._bytes > self.max_bytes):
+                _, evicted = self._levels.popitem(last=False)
+                self._bytes -= sum(image_nbytes(level) for level in evicted)
+    
+    def clear(self):
+        """Zwalnia wszystkie piramidy."""
+        with self._lock:
+            self._levels.clear()
+            self._bytes = 0
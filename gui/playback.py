@@ -0,0 +1,68 @@
+"""
+Wall-clock playback scheduling for the preview players.
+"""
+
+import time
+from collections import deque
+
+
+class PlaybackClock:
+    """Zegar odtwarzania oparty na czasie rzeczywistym.
+    
+    Pozycja (liczba klatek od startu) wynika z upływu czasu, a nie z liczby
+    wykonanych ticków, więc czas rysowania nie opóźnia odtwarzania - gdy
+    rysowanie nie nadąża, klatki są pomijane. Jeden zegar może sterować kilkoma
+    odtwarzaczami naraz (play_both); pokazują one wtedy tę samą pozycję.
+    """
+    
+    def __init__(self, fps):
+        self.fps = max(1, fps)
+        self.start = time.perf_counter()
+        self.offset = 0
+    
+    def position(self, now=None):
+        """Numer klatki (od startu), której termin już minął."""
+        if now is None:
+            now = time.perf_counter()
+        return self.offset + int((now - self.start) * self.fps)
+    
+    def deadline(self, position):
+        """Czas (perf_counter), w którym należy pokazać klatkę position."""
+        return self.start + (position - self.offset) / self.fps
+    
+    def set_fps(self, fps):
+        """Zmienia tempo bez skoku pozycji."""
+        now = time.perf_counter()
+        self.offset = self.position(now)
+        self.start = now
+        self.fps = max(1, fps)
+
+
+class PlaybackStats:
+    """Zmierzona liczba klatek na sekundę i liczba pominiętych klatek."""
+    
+    def __init__(self, window=1.0):
+        self.window = window
+        self.times = deque()
+        self.dropped = 0
+    
+    def shown(self, dropped=0, now=None):
+        """Rejestruje pokazaną klatkę (i klatki pominięte przed nią)."""
+        if now is None:
+            now = time.perf_counter()
+        self.dropped += dropped
+        self.times.append(now)
+        while len(self.times) > 2 and now - self.times[0] > self.window:
+            self.times.popleft()
+    
+    @property
+    def fps(self):
+        """Osiągnięta liczba klatek na sekundę w ostatnim oknie czasu."""
+        if len(self.times) < 2:
+            return 0.0
+        span = self.times[-1] - self.times[0]
+        return (len(self.times) - 1) / span if span > 0 else 0.0
+    
+    def reset(self):
+        self.times.clear()
+        self.dropped = 0
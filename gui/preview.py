@@ -2,36 +2,68 @@
 Preview player component for Glitch Lab.
 """
 
+import math
 import os
+import queue
+import threading
+import time
 import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk
 from pathlib import Path
 
 try:
     from PIL import Image, ImageTk
+    import numpy as np
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
 
 from core.utils import get_frame_info
 from config.languages import language_manager
+from gui.frame_source import LazyFrameSource, PyramidCache
+from gui.playback import PlaybackClock, PlaybackStats
 
 
 class PreviewPlayer:
     """Odtwarzacz podglądu animacji."""
     
+    LOAD_BATCH = 64  # Klatki przekazywane do odtwarzacza partiami podczas ładowania
+    LOAD_POLL_MS = 30  # Rytm odbioru wyników ładowania w wątku Tk
+    PLAYBACK_BUFFER = 8  # Klatki przygotowywane z wyprzedzeniem podczas odtwarzania
+    
     def __init__(self, parent, title, width=320, height=240):
         self.frame = ttk.LabelFrame(parent, text=title, padding=8)
         self.title = title  # Store title for updates
         self.width = width
         self.height = height
-        self.frames = []  # Thumbnails
-        self.full_frames = []  # Pełne obrazy
+        # Klatki dekodowane leniwie (LazyFrameSource) - w pamięci tylko okno wokół bieżącej;
+        # frames to ta sama sekwencja co full_frames (dawna nazwa listy miniatur)
+        self.full_frames = LazyFrameSource([])
+        self.frames = self.full_frames
         self.frame_paths = []  # Ścieżki do plików
+        self.pyramids = PyramidCache()  # Pomniejszone poziomy klatek dla zoomu < 100%
+        self.decode_executor = None
+        self.load_generation = 0  # Nowe ładowanie unieważnia wyniki poprzedniego
+        # Bufor gotowych PhotoImage dla kolejnych klatek odtwarzania (idx -> widok)
+        self.view_buffer = OrderedDict()
+        self.view_pending = {}  # (idx, view_key) -> Future
+        self.view_wanted = None  # Aktualny klucz widoku; zlecenia z innym kluczem są pomijane
+        self.view_ready = queue.SimpleQueue()
+        self.view_executor = None
         self.current_frame = 0
+        self.play_direction = 1
         self.playing = False
         self.fps = 24
         self.after_id = None
+        # Odtwarzanie według zegara (PlaybackClock) - pozycja z czasu, nie z liczby ticków
+        self.clock = None
+        self.play_origin = 0
+        self.play_position = 0
+        self.playback_stats = PlaybackStats()
+        self.playback_info_item = None
+        self.playback_info_time = 0.0
         
         # Zoom i pan
         self.zoom = 1.0
@@ -124,7 +156,12 @@ class PreviewPlayer:
                  font=('Segoe UI', 8)).pack(anchor=tk.W)
         
         self.photo = None
-        self.checkerboard_pattern = None
+        self.image_item = None  # Element canvas z obrazem, używany ponownie między klatkami
+        self.bg_item = None  # Element canvas z tłem obrazu: prostokąt ('rect') albo kratka ('image')
+        self.bg_item_kind = None
+        self.overlay_key = None  # Stan, dla którego narysowano overlay
+        self.checkerboard_photo = None  # Kratka tła, przebudowywana tylko przy zmianie rozmiaru
+        self.checkerboard_size = None
         
         # Zmienne dla overlay przycisków
         self.overlay_visible = True
@@ -227,6 +264,12 @@ class PreviewPlayer:
             anchor=tk.W, tags='overlay'
         )
         
+        # Osiągnięte / docelowe FPS i pominięte klatki podczas odtwarzania (lewy górny róg)
+        self.playback_info_item = self.canvas.create_text(
+            10, 10, text=self.playback_info_text(), fill='#00d4ff',
+            font=('Segoe UI', 8, 'bold'), anchor=tk.NW, tags='overlay'
+        )
+        
         # Prawa strona - opcje tła
         right_x = canvas_width - 10
         bg_buttons = [
@@ -301,162 +344,271 @@ class PreviewPlayer:
                 if self.frames:
                     self.show_frame(self.current_frame)
     
-    def load_frames(self, frame_paths, progress_callback=None):
-        """Ładuje klatki z listy ścieżek."""
+    def load_frames(self, frame_paths, progress_callback=None, on_complete=None):
+        """Ładuje klatki z listy ścieżek w tle.
+        
+        Nagłówki plików sprawdzane są w wątku roboczym, a gotowe klatki trafiają
+        do odtwarzacza partiami (odbieranymi w wątku Tk przez after) - pierwsza
+        klatka jest pokazywana od razu, a już załadowane można przewijać
+        i odtwarzać w trakcie ładowania reszty. Piksele dekoduje LazyFrameSource
+        dopiero przy wyświetlaniu. progress_callback i on_complete(liczba klatek)
+        wywoływane są w wątku Tk.
+        """
+        self._start_loading(lambda out: self._scan_paths(list(frame_paths), out),
+                            progress_callback, on_complete)
+    
+    def load_from_directory(self, directory, progress_callback=None, on_complete=None):
+        """Ładuje klatki z katalogu (skanowanie i ładowanie w tle, jak load_frames)."""
+        if not directory or not os.path.exists(directory):
+            return
+        
+        if progress_callback:
+            progress_callback("Skanowanie katalogu...")
+            # Resetuj pasek postępu na początku
+            progress_callback(0)
+        
+        self._start_loading(lambda out: self._scan_directory(directory, out),
+                            progress_callback, on_complete)
+    
+    def _start_loading(self, scan, progress_callback, on_complete):
+        """Resetuje odtwarzacz i uruchamia skanowanie klatek w wątku roboczym."""
         self.stop()
-        self.frames = []
-        self.full_frames = []
+        self.load_generation += 1
         self.frame_paths = []
+        self.pyramids.clear()
+        self.view_buffer.clear()
+        for future in self.view_pending.values():
+            future.cancel()
+        self.view_pending.clear()
         self.current_frame = 0
         # Reset zoom i pan
         self.zoom = 1.0
         self.pan_x = 0
         self.pan_y = 0
         
+        if self.decode_executor is None:
+            self.decode_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='preview-decode')
+        # Zlecenia poprzedniego źródła nie mogą blokować wspólnego wykonawcy
+        self.full_frames.cancel_pending()
+        self.full_frames = LazyFrameSource([], executor=self.decode_executor)
+        self.frames = self.full_frames
+        
+        out = queue.SimpleQueue()
+        threading.Thread(target=scan, args=(out,), daemon=True, name='preview-scan').start()
+        self._poll_loading(self.load_generation, out, progress_callback, on_complete)
+    
+    def _scan_directory(self, directory, out):
+        """Wątek roboczy: wyszukuje pliki klatek w katalogu i sprawdza ich nagłówki."""
+        frames = []
+        try:
+            for file in Path(directory).iterdir():
+                if file.is_file():
+                    frame_num, ext, _ = get_frame_info(file.name)
+                    if frame_num is not None:
+                        frames.append((frame_num, file))
+        except OSError:
+            pass
+        
+        frames.sort(key=lambda x: x[0])
+        
+        out.put(('message', "=" * 30))
+        out.put(('message', "Ładowanie podglądu..."))
+        out.put(('message', f"Znaleziono {len(frames)} klatek"))
+        self._scan_paths([str(f[1]) for f in frames], out)
+    
+    def _scan_paths(self, frame_paths, out):
+        """Wątek roboczy: sprawdza nagłówki plików i wysyła poprawne ścieżki partiami."""
+        batch = []
+        sent = False
+        first_size = None
         total_frames = len(frame_paths)
         for i, path in enumerate(frame_paths):
             try:
-                img = Image.open(path)
-                # Zapisz pełny obraz
-                self.full_frames.append(img.copy())
-                self.frame_paths.append(path)
-                # Utwórz thumbnail
-                thumb = img.copy()
-                thumb.thumbnail((self.canvas_width, self.canvas_height), Image.Resampling.LANCZOS)
-                self.frames.append(thumb)
-                
-                # Callback postępu - aktualizuj częściej dla płynności
-                if progress_callback and total_frames > 0:
-                    progress = round((i + 1) / total_frames * 100)
-                    # Aktualizuj komunikat co 5% lub co klatkę dla małych zestawów
-                    update_frequency = max(1, total_frames // 20) if total_frames > 20 else 1
-                    if i == 0 or (i + 1) % update_frequency == 0 or i == total_frames - 1:
-                        progress_callback(language_manager.t('loading_frames', current=i + 1, total=total_frames, percent=progress))
-                    
-                    # Sprawdź czy progress_callback ma metodę update_progress_only dla częstszych aktualizacji
-                    if hasattr(progress_callback, '__self__') and hasattr(progress_callback.__self__, 'update_progress_only'):
-                        progress_callback.__self__.update_progress_only(progress)
-                    elif isinstance(progress, (int, float)):
-                        # Fallback - wyślij wartość liczbową przez zwykły callback
-                        progress_callback(progress)
+                # Sam nagłówek - sprawdza czy plik jest obrazem, bez dekodowania pikseli
+                with Image.open(path) as img:
+                    if first_size is None:
+                        first_size = img.size
+                batch.append(path)
             except:
                 pass
-        
-        if self.frames:
+            # Pierwsza klatka wysyłana od razu, kolejne partiami
+            if batch and (not sent or len(batch) >= self.LOAD_BATCH):
+                out.put(('frames', batch, first_size))
+                batch = []
+                sent = True
+            out.put(('progress', i + 1, total_frames))
+        if batch:
+            out.put(('frames', batch, first_size))
+        out.put(('done',))
+    
+    def _poll_loading(self, generation, out, progress_callback, on_complete):
+        """Wątek Tk: odbiera wyniki skanowania; nowsze ładowanie unieważnia starsze."""
+        if generation != self.load_generation:
+            return
+        last_progress = None
+        while True:
+            try:
+                item = out.get_nowait()
+            except queue.Empty:
+                break
+            kind = item[0]
+            if kind == 'message':
+                if progress_callback:
+                    progress_callback(item[1])
+            elif kind == 'frames':
+                self._append_frames(item[1], item[2])
+            elif kind == 'progress':
+                last_progress = item[1:]
+            elif kind == 'done':
+                if last_progress:
+                    self._report_loading(progress_callback, *last_progress)
+                self._finish_loading(progress_callback, on_complete)
+                return
+        if last_progress:
+            self._report_loading(progress_callback, *last_progress)
+        self.frame.after(self.LOAD_POLL_MS, self._poll_loading, generation, out, progress_callback, on_complete)
+    
+    def _append_frames(self, paths, first_size):
+        """Dołącza partię ścieżek do odtwarzacza; pierwsza partia od razu pokazuje klatkę."""
+        was_empty = not self.frame_paths
+        self.frame_paths.extend(paths)
+        self.full_frames.extend(paths)
+        self.slider.configure(to=max(1, len(self.frames) - 1))
+        if was_empty:
             # Ustaw aspect ratio pierwszego obrazu
-            if self.full_frames:
-                img = self.full_frames[0]
-                self.image_aspect_ratio = img.width / img.height if img.height > 0 else None
-            self.slider.configure(to=len(self.frames) - 1)
+            if first_size:
+                width, height = first_size
+                self.image_aspect_ratio = width / height if height > 0 else None
             self.show_frame(0)
-            self.frame_info_var.set(f"Klatka 1/{len(self.frames)}")
+        self.frame_info_var.set(f"Klatka {self.current_frame + 1}/{len(self.frames)}")
+    
+    def _report_loading(self, progress_callback, current, total_frames):
+        """Postęp ładowania - komunikat co 5% lub co klatkę dla małych zestawów."""
+        if not progress_callback or total_frames <= 0:
+            return
+        progress = round(current / total_frames * 100)
+        update_frequency = max(1, total_frames // 20) if total_frames > 20 else 1
+        last_reported = getattr(self, '_last_reported_load', 0)
+        if current == 1 or current // update_frequency != last_reported // update_frequency or current == total_frames:
+            progress_callback(language_manager.t('loading_frames', current=current, total=total_frames, percent=progress))
+        self._last_reported_load = current
+        
+        # Sprawdź czy progress_callback ma metodę update_progress_only dla częstszych aktualizacji
+        if hasattr(progress_callback, '__self__') and hasattr(progress_callback.__self__, 'update_progress_only'):
+            progress_callback.__self__.update_progress_only(progress)
+        elif isinstance(progress, (int, float)):
+            # Fallback - wyślij wartość liczbową przez zwykły callback
+            progress_callback(progress)
+    
+    def _finish_loading(self, progress_callback, on_complete):
+        """Kończy ładowanie: komunikat końcowy i on_complete."""
+        self._last_reported_load = 0
+        if self.frames:
             if progress_callback:
                 progress_callback(f"✓ Załadowano {len(self.frames)} klatek do podglądu")
         else:
             self.frame_info_var.set("Brak klatek")
             self.zoom_info_var.set("Zoom: -")
             self.image_aspect_ratio = None
-            self.canvas.delete("all")
+            self.clear_canvas()
             self.update_metadata(None)
             if progress_callback:
                 progress_callback("⚠ Nie znaleziono klatek do załadowania")
+        if on_complete:
+            on_complete(len(self.frames))
     
-    def load_from_directory(self, directory, progress_callback=None):
-        """Ładuje klatki z katalogu."""
-        if not directory or not os.path.exists(directory):
-            return
-        
-        if progress_callback:
-            progress_callback("Skanowanie katalogu...")
-            # Resetuj pasek postępu na początku
-            progress_callback(0)
-        
-        frames = []
-        for file in Path(directory).iterdir():
-            if file.is_file():
-                frame_num, ext, _ = get_frame_info(file.name)
-                if frame_num is not None:
-                    frames.append((frame_num, file))
-        
-        frames.sort(key=lambda x: x[0])
-        
-        if progress_callback:
-            progress_callback("=" * 30)
-            progress_callback("Ładowanie podglądu...")
-            progress_callback(f"Znaleziono {len(frames)} klatek")
-        
-        self.load_frames([str(f[1]) for f in frames], progress_callback)
-    
-    def create_checkerboard(self, size=20):
-        """Tworzy wzór kratki jako obraz PIL."""
-        pattern = Image.new('RGB', (size * 2, size * 2), color='white')
-        pixels = pattern.load()
-        for y in range(size * 2):
-            for x in range(size * 2):
-                if (x // size + y // size) % 2 == 0:
-                    pixels[x, y] = (240, 240, 240)  # Jasny szary
-                else:
-                    pixels[x, y] = (200, 200, 200)  # Ciemniejszy szary
-        return pattern
+    def create_checkerboard(self, width, height, size=20):
+        """Tworzy wzór kratki o rozmiarze width x height jako obraz PIL (numpy, bez pętli po pikselach)."""
+        rows = (np.arange(height) // size)[:, None]
+        cols = (np.arange(width) // size)[None, :]
+        # Jasny szary (240) i ciemniejszy szary (200) na przemian
+        pattern = np.where((rows + cols) % 2 == 0, 240, 200).astype(np.uint8)
+        return Image.fromarray(pattern, 'L')
     
     def draw_image_background(self, img_width, img_height, x, y):
-        """Rysuje tło obrazu pod obrazem z alpha."""
+        """Rysuje tło obrazu pod obrazem z alpha.
+        
+        Element tła jest jeden i używany ponownie między klatkami (coords/itemconfigure);
+        nowy powstaje tylko przy zmianie rodzaju tła (prostokąt <-> kratka).
+        """
         bg_mode = self.bg_var.get()
         margin = 5  # Margines wokół obrazu
         
-        if bg_mode == 'black':
-            # Czarne tło obrazu
-            self.canvas.create_rectangle(
-                x - margin, y - margin,
-                x + img_width + margin, y + img_height + margin,
-                fill='#0d0d0d', outline='', tags='image_bg'
-            )
-        elif bg_mode == 'white':
-            # Białe tło obrazu
-            self.canvas.create_rectangle(
-                x - margin, y - margin,
-                x + img_width + margin, y + img_height + margin,
-                fill='white', outline='', tags='image_bg'
-            )
+        if bg_mode in ('black', 'white'):
+            # Czarne albo białe tło obrazu
+            fill = '#0d0d0d' if bg_mode == 'black' else 'white'
+            coords = (x - margin, y - margin, x + img_width + margin, y + img_height + margin)
+            if self.bg_item_kind != 'rect':
+                self._replace_bg_item('rect', self.canvas.create_rectangle(
+                    *coords, fill=fill, outline='', tags='image_bg'))
+            else:
+                self.canvas.coords(self.bg_item, *coords)
+                self.canvas.itemconfigure(self.bg_item, fill=fill, state=tk.NORMAL)
         elif bg_mode == 'checkerboard':
-            # Wzór kratki jako tło obrazu
-            if self.checkerboard_pattern is None:
-                self.checkerboard_pattern = self.create_checkerboard()
-            # Utwórz obraz kratki o rozmiarze obrazu + margines
-            pattern_width = img_width + margin * 2
-            pattern_height = img_height + margin * 2
-            pattern_img = Image.new('RGB', (pattern_width, pattern_height))
-            for py in range(0, pattern_height, 20):
-                for px in range(0, pattern_width, 20):
-                    pattern_img.paste(self.checkerboard_pattern, (px, py))
-            self.checkerboard_photo = ImageTk.PhotoImage(pattern_img)
-            self.canvas.create_image(x - margin, y - margin, anchor=tk.NW, 
-                                    image=self.checkerboard_photo, tags='image_bg')
+            # Wzór kratki jako tło obrazu - o rozmiarze obrazu + margines, przebudowywany
+            # tylko gdy ten rozmiar się zmieni (zoom, zmiana rozmiaru okna)
+            pattern_size = (img_width + margin * 2, img_height + margin * 2)
+            if self.checkerboard_size != pattern_size:
+                self.checkerboard_photo = ImageTk.PhotoImage(self.create_checkerboard(*pattern_size))
+                self.checkerboard_size = pattern_size
+            if self.bg_item_kind != 'image':
+                self._replace_bg_item('image', self.canvas.create_image(
+                    x - margin, y - margin, anchor=tk.NW, image=self.checkerboard_photo, tags='image_bg'))
+            else:
+                self.canvas.coords(self.bg_item, x - margin, y - margin)
+                self.canvas.itemconfigure(self.bg_item, image=self.checkerboard_photo, state=tk.NORMAL)
+        else:
+            self.hide_image_background()
     
-    def show_frame(self, idx):
-        """Wyświetla klatkę o danym indeksie."""
-        if not self.frames or idx < 0 or idx >= len(self.frames):
-            return
-        
-        self.current_frame = idx
-        
-        # Użyj pełnego obrazu jeśli dostępny, w przeciwnym razie thumbnail
-        if idx < len(self.full_frames):
-            img = self.full_frames[idx].copy()
-            # Aktualizuj aspect ratio
-            self.image_aspect_ratio = img.width / img.height if img.height > 0 else None
+    def _replace_bg_item(self, kind, item):
+        """Zastępuje element tła nowym (innego rodzaju) i umieszcza go pod obrazem."""
+        if self.bg_item is not None:
+            self.canvas.delete(self.bg_item)
+        self.bg_item = item
+        self.bg_item_kind = kind
+        self.canvas.tag_lower(item)
+    
+    def hide_image_background(self):
+        """Ukrywa tło obrazu, nie usuwając elementu canvas."""
+        if self.bg_item is not None:
+            self.canvas.itemconfigure(self.bg_item, state=tk.HIDDEN)
+    
+    def render_viewport(self, idx, img, zoom, pan_x, pan_y, canvas_width, canvas_height):
+        """Widoczny na canvas fragment klatki po zoomie -> (obraz albo None, x, y).
+        
+        Prostokąt widoczny na canvas jest przeliczany na współrzędne źródła
+        i skalowany jest tylko on, więc koszt przerysowania zależy od rozmiaru
+        canvas, a nie od zoomu. Przy zoomie < 100% źródłem jest poziom piramidy.
+        (x, y) to pozycja lewego górnego rogu fragmentu na canvas.
+        """
+        width = max(1, int(img.width * zoom))
+        height = max(1, int(img.height * zoom))
+        x = int(canvas_width // 2 - width // 2 + pan_x)
+        y = int(canvas_height // 2 - height // 2 + pan_y)
+        
+        # Widoczna część obrazu we współrzędnych obrazu po zoomie
+        left = max(0, -x)
+        top = max(0, -y)
+        right = min(width, canvas_width - x)
+        bottom = min(height, canvas_height - y)
+        if right <= left or bottom <= top:
+            return None, x, y
+        
+        if (width, height) == img.size:
+            if (left, top, right, bottom) == (0, 0, width, height):
+                view = img
+            else:
+                view = img.crop((left, top, right, bottom))
         else:
-            img = self.frames[idx].copy()
-        
-        # Zastosuj zoom
-        if self.zoom != 1.0:
-            new_width = int(img.width * self.zoom)
-            new_height = int(img.height * self.zoom)
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        self.canvas.delete("all")
-        
-        # Oblicz pozycję z uwzględnieniem pan
+            source, _ = self.pyramids.level_for(idx, img, zoom)
+            scale_x = source.width / width
+            scale_y = source.height / height
+            box = (left * scale_x, top * scale_y, right * scale_x, bottom * scale_y)
+            view = source.resize((right - left, bottom - top), Image.Resampling.LANCZOS, box=box)
+        return view, x + left, y + top
+    
+    def view_key(self):
+        """Parametry widoku (zoom, pan, rozmiar canvas) - klucz ważności przygotowanych klatek."""
         # Użyj rzeczywistego rozmiaru canvas, jeśli dostępny, w przeciwnym razie użyj przechowywanych wartości
         actual_width = self.canvas.winfo_width()
         actual_height = self.canvas.winfo_height()
@@ -466,27 +618,139 @@ class PreviewPlayer:
             actual_width = self.canvas_width
         if actual_height <= 1:
             actual_height = self.canvas_height
+        return self.zoom, self.pan_x, self.pan_y, actual_width, actual_height
+    
+    def draw_view(self, x, y):
+        """Rysuje self.photo z tłem, używając ponownie elementów canvas zamiast tworzyć je od nowa."""
+        if self.photo is None:
+            if self.image_item is not None:
+                self.canvas.itemconfigure(self.image_item, state=tk.HIDDEN)
+            self.hide_image_background()
+            return
         
-        canvas_center_x = actual_width // 2
-        canvas_center_y = actual_height // 2
-        
-        x = canvas_center_x - img.width // 2 + self.pan_x
-        y = canvas_center_y - img.height // 2 + self.pan_y
-        
-        # Rysuj tło obrazu przed obrazem
-        self.draw_image_background(img.width, img.height, x, y)
+        # Rysuj tło obrazu pod obrazem
+        self.draw_image_background(self.photo.width(), self.photo.height(), x, y)
         
         # Rysuj obraz
-        self.photo = ImageTk.PhotoImage(img)
-        self.canvas.create_image(x, y, anchor=tk.NW, image=self.photo, tags='image')
+        if self.image_item is None:
+            self.image_item = self.canvas.create_image(x, y, anchor=tk.NW, image=self.photo, tags='image')
+        else:
+            self.canvas.coords(self.image_item, x, y)
+            self.canvas.itemconfigure(self.image_item, image=self.photo, state=tk.NORMAL)
+    
+    def refresh_overlay(self):
+        """Przerysowuje overlay tylko gdy zmienił się jego stan (widoczność, rozmiar, zoom, tło)."""
+        overlay_key = (self.overlay_visible, self.canvas.winfo_width(), self.canvas.winfo_height(),
+                       self.zoom_info_var.get(), self.bg_var.get())
+        if overlay_key != self.overlay_key:
+            self.canvas.delete('overlay')
+            self.playback_info_item = None
+            self.draw_overlay_controls()
+            self.overlay_key = overlay_key
+        self.canvas.tag_raise('overlay')
+    
+    def clear_canvas(self):
+        """Czyści canvas (obraz, tło i overlay)."""
+        self.canvas.delete("all")
+        self.image_item = None
+        self.bg_item = None
+        self.bg_item_kind = None
+        self.overlay_key = None
+        self.playback_info_item = None
+    
+    def fill_view_buffer(self, idx):
+        """Zleca w tle przygotowanie widoku kolejnych PLAYBACK_BUFFER klatek odtwarzania.
+        
+        Fragmenty widoku (render_viewport) powstają w wątku roboczym jako obrazy
+        PIL; na PhotoImage zamieniane są w wątku Tk, w czasie bezczynności
+        (convert_ready_views). Klatki spoza okna albo z innym widokiem
+        (zoom, pan, rozmiar canvas) są odrzucane - gotowe z bufora, oczekujące
+        zlecenia są anulowane, a już rozpoczęte pomijają renderowanie.
+        """
+        view_key = self.view_key()
+        self.view_wanted = view_key
+        count = min(self.PLAYBACK_BUFFER, len(self.frames) - 1)
+        upcoming = [(idx + step * self.play_direction) % len(self.frames) for step in range(1, count + 1)]
+        for target in list(self.view_buffer):
+            if target not in upcoming or self.view_buffer[target][0] != view_key:
+                del self.view_buffer[target]
+        for pending_key, future in list(self.view_pending.items()):
+            target, pending_view = pending_key
+            if (target not in upcoming or pending_view != view_key) and future.cancel():
+                del self.view_pending[pending_key]
+        
+        if self.view_executor is None:
+            self.view_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='preview-view')
+        source = self.full_frames
+        for target in upcoming:
+            if target in self.view_buffer or (target, view_key) in self.view_pending:
+                continue
+            self.view_pending[(target, view_key)] = self.view_executor.submit(
+                self._render_view_async, self.load_generation, source, target, view_key)
+        self.frame.after_idle(self.convert_ready_views)
+    
+    def _render_view_async(self, generation, source, idx, view_key):
+        """Wątek roboczy: fragment widoku klatki jako obraz PIL (bez Tk)."""
+        view = x = y = aspect_ratio = None
+        # Pomiń zlecenia nieaktualne (nowe ładowanie albo zmiana widoku)
+        if generation == self.load_generation and self.playing and view_key == self.view_wanted:
+            try:
+                img = source[idx]
+                aspect_ratio = img.width / img.height if img.height > 0 else None
+                view, x, y = self.render_viewport(idx, img, *view_key)
+            except Exception:
+                view = None
+        self.view_ready.put((generation, idx, view_key, view, x, y, aspect_ratio))
+    
+    def convert_ready_views(self):
+        """Wątek Tk: zamienia gotowe fragmenty na PhotoImage i dodaje do bufora."""
+        while True:
+            try:
+                generation, idx, view_key, view, x, y, aspect_ratio = self.view_ready.get_nowait()
+            except queue.Empty:
+                break
+            self.view_pending.pop((idx, view_key), None)
+            if generation != self.load_generation or view is None or not self.playing:
+                continue
+            self.view_buffer[idx] = (view_key, ImageTk.PhotoImage(view), x, y, aspect_ratio)
+    
+    def show_frame(self, idx):
+        """Wyświetla klatkę o danym indeksie."""
+        if not self.frames or idx < 0 or idx >= len(self.frames):
+            return
         
-        # Rysuj overlay kontrolki
-        self.draw_overlay_controls()
+        self.current_frame = idx
+        view_key = self.view_key()
+        
+        prepared = self.view_buffer.pop(idx, None)
+        if prepared is not None and prepared[0] == view_key:
+            # Widok przygotowany z wyprzedzeniem podczas odtwarzania
+            _, self.photo, x, y, aspect_ratio = prepared
+            if aspect_ratio is not None:
+                self.image_aspect_ratio = aspect_ratio
+        else:
+            img = self.full_frames[idx]
+            # Aktualizuj aspect ratio
+            self.image_aspect_ratio = img.width / img.height if img.height > 0 else None
+            
+            # Skaluj tylko fragment widoczny na canvas
+            view, x, y = self.render_viewport(idx, img, *view_key)
+            self.photo = ImageTk.PhotoImage(view) if view is not None else None
+        
+        self.draw_view(x, y)
         
         # Aktualizuj informacje o zoomie
         zoom_percent = int(self.zoom * 100)
         self.zoom_info_var.set(f"Zoom: {zoom_percent}%")
         
+        # Rysuj overlay kontrolki
+        self.refresh_overlay()
+        
+        # Dekoduj w tle kolejne klatki w kierunku odtwarzania
+        self.full_frames.prefetch(idx, self.play_direction)
+        if self.playing:
+            self.fill_view_buffer(idx)
+        
         # Aktualizuj informacje o klatce
         self.frame_info_var.set(f"Klatka {idx + 1}/{len(self.frames)}")
         self.slider.set(idx)
@@ -679,10 +943,12 @@ class PreviewPlayer:
     
     def next_frame(self):
         if self.frames:
+            self.play_direction = 1
             self.show_frame((self.current_frame + 1) % len(self.frames))
     
     def prev_frame(self):
         if self.frames:
+            self.play_direction = -1
             self.show_frame((self.current_frame - 1) % len(self.frames))
     
     def toggle_play(self):
@@ -691,26 +957,66 @@ class PreviewPlayer:
         else:
             self.play()
     
-    def play(self):
+    def play(self, clock=None):
+        """Rozpoczyna odtwarzanie od bieżącej klatki.
+        
+        clock pozwala kilku odtwarzaczom dzielić jeden PlaybackClock (play_both),
+        dzięki czemu pokazują tę samą pozycję; domyślnie tworzony jest własny.
+        """
         if not self.frames:
             return
+        if self.playing:
+            self.stop()
         self.playing = True
+        self.clock = clock or PlaybackClock(self.fps_var.get())
+        self.play_position = self.clock.position()
+        self.play_origin = self.current_frame - self.play_position
+        self.play_direction = 1
+        self.playback_stats.reset()
         self.play_btn.configure(text="⏸")
         self.animate()
     
     def stop(self):
         self.playing = False
+        self.clock = None
         self.play_btn.configure(text="▶")
         if self.after_id:
             self.frame.after_cancel(self.after_id)
             self.after_id = None
+        self.update_playback_info(force=True)
     
     def animate(self):
+        """Tick odtwarzania: pokazuje klatkę wynikającą z zegara i planuje tick na termin następnej.
+        
+        Czas rysowania nie przesuwa harmonogramu; gdy rysowanie nie nadąża,
+        pośrednie klatki są pomijane (i liczone w statystyce).
+        """
+        self.after_id = None
         if not self.playing:
             return
-        self.next_frame()
-        delay = int(1000 / self.fps_var.get())
-        self.after_id = self.frame.after(delay, self.animate)
+        position = self.clock.position()
+        if position > self.play_position:
+            self.playback_stats.shown(dropped=position - self.play_position - 1)
+            self.play_position = position
+            self.play_direction = 1
+            self.show_frame((self.play_origin + position) % len(self.frames))
+            self.update_playback_info()
+        delay = self.clock.deadline(self.play_position + 1) - time.perf_counter()
+        self.after_id = self.frame.after(max(1, math.ceil(delay * 1000)), self.animate)
+    
+    def playback_info_text(self):
+        """Tekst statystyk odtwarzania dla overlay (pusty gdy nie odtwarza)."""
+        if not self.playing or self.clock is None:
+            return ""
+        return f"{self.playback_stats.fps:.1f}/{self.clock.fps} FPS · pominięte: {self.playback_stats.dropped}"
+    
+    def update_playback_info(self, force=False):
+        """Aktualizuje statystyki odtwarzania w overlay (najwyżej 4 razy na sekundę)."""
+        now = time.perf_counter()
+        if self.playback_info_item is None or (not force and now - self.playback_info_time < 0.25):
+            return
+        self.playback_info_time = now
+        self.canvas.itemconfigure(self.playback_info_item, text=self.playback_info_text())
     
     def on_slider(self, value):
         if self.frames:
@@ -730,6 +1036,8 @@ class PreviewPlayer:
     
     def update_fps(self):
         self.fps = self.fps_var.get()
+        if self.clock is not None:
+            self.clock.set_fps(self.fps)
     
     def on_language_changed(self, language):
         """Called when the language changes to update UI elements."""
@@ -9,11 +9,11 @@ import re
 import random
 import math
 import json
+import tempfile
 import webbrowser
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
-import threading
 
 try:
     from PIL import Image, ImageTk, ImageEnhance, ImageFilter
@@ -23,15 +23,24 @@ except ImportError:
     PIL_AVAILABLE = False
 
 # Import modularnych komponentów
-from core.utils import get_frame_info
-from core.processing import process_frames, apply_glitch_to_image
+from core.utils import get_frame_info, file_digest, frame_rng, new_render_seed
+from core.processing import apply_glitch_to_image
+from core.plan import RenderPlan
+from core.cache import RenderCache, cache_key
+from core.jobs import RenderJob, format_duration
+from core.progress import ProgressChannel
 from core.animation import calculate_glitch_intensity
 from config.effects_registry import get_effects, get_default_effect_params
 from config.languages import language_manager
 from gui.theme import NeonTheme
 from gui.preview import PreviewPlayer
+from gui.playback import PlaybackClock
 from gui.animation_editor import AnimationEditorWindow
 
+# Odbiór postępu renderu w wątku Tk: okres odpytywania i limit linii logu na jedno odpytanie
+PROGRESS_POLL_MS = 100
+LOG_LINES_PER_POLL = 50
+
 
 class App:
     def __init__(self, root):
@@ -47,6 +56,13 @@ class App:
         # Register language change callback
         language_manager.register_callback(self.on_language_changed)
         
+        # Wspólny cache wyrenderowanych klatek (render i podgląd); stały seed
+        # podglądu sprawia, że ta sama konfiguracja daje trafienie w cache
+        self.render_cache = RenderCache()
+        self.preview_seed = new_render_seed()
+        self.preview_temp_path = None  # Plik ostatniego podglądu klatki (usuwany po zdekodowaniu)
+        self.render_job = None
+        
         # Główny kontener
         main_paned = ttk.PanedWindow(root, orient=tk.HORIZONTAL)
         main_paned.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
@@ -512,6 +528,40 @@ class App:
         self.status_var = tk.StringVar(value=language_manager.t('status_ready'))
         ttk.Label(progress_frame, textvariable=self.status_var, style='Accent.TLabel').pack()
         
+        # Render przyrostowy - przeliczane są tylko klatki zmienione od poprzedniego renderu
+        self.incremental_var = tk.BooleanVar(value=True)
+        self.ui_elements['incremental_checkbox'] = ttk.Checkbutton(progress_frame, text=language_manager.t('incremental_render'),
+                                                                   variable=self.incremental_var)
+        self.ui_elements['incremental_checkbox'].pack(anchor=tk.W, pady=(5, 0))
+        
+        # Cache klatek na dysku (~/.cache/glitchlab) - domyślnie wyłączony
+        self.frame_cache_var = tk.BooleanVar(value=False)
+        self.ui_elements['frame_cache_checkbox'] = ttk.Checkbutton(progress_frame, text=language_manager.t('frame_cache'),
+                                                                   variable=self.frame_cache_var)
+        self.ui_elements['frame_cache_checkbox'].pack(anchor=tk.W)
+        
+        # Seed renderu - puste pole: seed z manifestu (render przyrostowy) albo losowy;
+        # nowy seed daje nową wariację glitcha także przy renderze przyrostowym
+        seed_frame = ttk.Frame(progress_frame)
+        seed_frame.pack(anchor=tk.W, pady=(5, 0))
+        self.ui_elements['seed_label'] = ttk.Label(seed_frame, text=language_manager.t('render_seed'))
+        self.ui_elements['seed_label'].pack(side=tk.LEFT)
+        self.seed_var = tk.StringVar(value='')
+        ttk.Entry(seed_frame, textvariable=self.seed_var, width=14).pack(side=tk.LEFT, padx=5)
+        self.ui_elements['new_seed_btn'] = ttk.Button(seed_frame, text=language_manager.t('new_seed'),
+                                                      command=lambda: self.seed_var.set(str(new_render_seed())))
+        self.ui_elements['new_seed_btn'].pack(side=tk.LEFT)
+        
+        # Sterowanie trwającym renderem
+        job_btn_frame = ttk.Frame(progress_frame)
+        job_btn_frame.pack(pady=(5, 0))
+        self.pause_btn = ttk.Button(job_btn_frame, text=language_manager.t('pause_render'), command=self.toggle_pause_process, state=tk.DISABLED)
+        self.ui_elements['pause_btn'] = self.pause_btn
+        self.pause_btn.pack(side=tk.LEFT, padx=5)
+        self.cancel_btn = ttk.Button(job_btn_frame, text=language_manager.t('cancel_render'), command=self.cancel_process, state=tk.DISABLED)
+        self.ui_elements['cancel_btn'] = self.cancel_btn
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        
         # Przyciski akcji - na samym spodzie
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(pady=(5, 10))
@@ -798,6 +848,18 @@ class App:
         self.log_text.configure(state=tk.DISABLED)
         self.root.update_idletasks()
     
+    def log_lines(self, messages):
+        """Dodaje wiele wiadomości do logu jednym wstawieniem (bez wymuszania odświeżenia)."""
+        if not hasattr(self, 'log_text') or not messages:
+            return
+        
+        import datetime
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        self.log_text.configure(state=tk.NORMAL)
+        self.log_text.insert(tk.END, ''.join(f"[{timestamp}] {message}\n" for message in messages))
+        self.log_text.see(tk.END)
+        self.log_text.configure(state=tk.DISABLED)
+    
     def clear_log(self):
         """Czyści log."""
         self.log_text.configure(state=tk.NORMAL)
@@ -1218,8 +1280,21 @@ class App:
                 self.ui_elements['advanced_checkbox'].config(text=language_manager.t('advanced_mode'))
             if 'progress_frame' in self.ui_elements:
                 self.ui_elements['progress_frame'].config(text=language_manager.t('progress_section'))
+            if 'incremental_checkbox' in self.ui_elements:
+                self.ui_elements['incremental_checkbox'].config(text=language_manager.t('incremental_render'))
+            if 'frame_cache_checkbox' in self.ui_elements:
+                self.ui_elements['frame_cache_checkbox'].config(text=language_manager.t('frame_cache'))
+            if 'seed_label' in self.ui_elements:
+                self.ui_elements['seed_label'].config(text=language_manager.t('render_seed'))
+            if 'new_seed_btn' in self.ui_elements:
+                self.ui_elements['new_seed_btn'].config(text=language_manager.t('new_seed'))
             if 'start_btn' in self.ui_elements:
                 self.ui_elements['start_btn'].config(text=language_manager.t('generate'))
+            if 'pause_btn' in self.ui_elements:
+                paused = self.render_job is not None and self.render_job.status == RenderJob.PAUSED
+                self.ui_elements['pause_btn'].config(text=language_manager.t('resume_render' if paused else 'pause_render'))
+            if 'cancel_btn' in self.ui_elements:
+                self.ui_elements['cancel_btn'].config(text=language_manager.t('cancel_render'))
             if 'refresh_btn' in self.ui_elements:
                 self.ui_elements['refresh_btn'].config(text=language_manager.t('refresh'))
             if 'preview_btn' in self.ui_elements:
@@ -1491,9 +1566,10 @@ class App:
             if not self.output_var.get():
                 self.output_var.set(path + "_glitched")
             self.log(language_manager.t('log_input_selected', path=path))
-            self.original_player.load_from_directory(path, self.log)
-            self.update_sync_slider_range()
-            self.log(language_manager.t('log_frames_loaded', count=len(self.original_player.frames)))
+            def on_loaded(count):
+                self.update_sync_slider_range()
+                self.log(language_manager.t('log_frames_loaded', count=count))
+            self.original_player.load_from_directory(path, self.log, on_complete=on_loaded)
     
     def browse_output(self):
         """Wybiera katalog wyjściowy."""
@@ -1614,18 +1690,30 @@ class App:
             self.log(f"Błąd tworzenia katalogu wyjściowego: {str(e)}")
             return
         
-        # Odśwież podgląd oryginału
-        self.original_player.load_from_directory(output_dir, self.log)
-        self.update_sync_slider_range()
-        self.log(f"Załadowano {len(self.original_player.frames)} klatek do podglądu oryginału")
+        # Odśwież podgląd oryginału (ładowanie w tle)
+        def on_loaded(count):
+            self.update_sync_slider_range()
+            self.log(f"Załadowano {count} klatek do podglądu oryginału")
+        self.original_player.load_from_directory(output_dir, self.log, on_complete=on_loaded)
     
     def refresh_previews(self):
         """Odświeża podglądy."""
         self.log("Odświeżanie podglądów...")
-        self.original_player.load_from_directory(self.input_var.get(), self.log)
-        self.output_player.load_from_directory(self.output_var.get(), self.log)
-        self.update_sync_slider_range()
-        self.log(f"Oryginał: {len(self.original_player.frames)} klatek, Wynik: {len(self.output_player.frames)} klatek")
+        pending = [2]
+        
+        def on_loaded(count):
+            # Podsumowanie po załadowaniu obu podglądów
+            self.update_sync_slider_range()
+            pending[0] -= 1
+            if pending[0] == 0:
+                self.log(f"Oryginał: {len(self.original_player.frames)} klatek, Wynik: {len(self.output_player.frames)} klatek")
+        
+        for player, directory in ((self.original_player, self.input_var.get()),
+                                  (self.output_player, self.output_var.get())):
+            if directory and os.path.exists(directory):
+                player.load_from_directory(directory, self.log, on_complete=on_loaded)
+            else:
+                on_loaded(0)
     
     def preview_current_frame(self):
         """Renderuje aktualnie wybraną klatkę z włączonymi efektami i ładuje do podglądu."""
@@ -1649,11 +1737,9 @@ class App:
         if not self.glitch_enabled_var.get():
             self.log("Glitch wyłączony - pokazuję oryginał")
             # Skopiuj oryginalną klatkę do podglądu wyniku
-            temp_path = "temp_preview_original.png"
+            temp_path = self.new_preview_temp_path()
             original_img.save(temp_path)
-            self.output_player.load_frames([temp_path])
-            # Usuń plik tymczasowy po chwili
-            self.root.after(1000, lambda: os.path.exists(temp_path) and os.remove(temp_path))
+            self.load_preview_file(temp_path)
             return
         
         # Zastosuj efekty
@@ -1666,17 +1752,25 @@ class App:
         effect_params = self.effect_params if self.advanced_mode_var.get() else {}
         
         try:
-            # Zastosuj efekty
-            result_img = apply_glitch_to_image(original_img, self.intensity_var.get(), 
-                                             enabled_effects, effect_params)
+            temp_path = self.new_preview_temp_path()
+            plan = RenderPlan(enabled_effects, effect_params)
+            key = None
+            if self.frame_cache_var.get() and current_idx < len(self.original_player.frame_paths):
+                key = cache_key(file_digest(self.original_player.frame_paths[current_idx]), plan.digest,
+                                self.intensity_var.get(), self.preview_seed, current_idx)
             
-            # Zapisz tymczasowo i załaduj do podglądu
-            temp_path = "temp_preview.png"
-            result_img.save(temp_path)
-            self.output_player.load_frames([temp_path])
-            
-            # Usuń plik tymczasowy po chwili
-            self.root.after(1000, lambda: os.path.exists(temp_path) and os.remove(temp_path))
+            if key is not None and self.render_cache.fetch(key, temp_path):
+                self.log("Podgląd z cache")
+            else:
+                # Zastosuj efekty
+                result_img = apply_glitch_to_image(original_img, self.intensity_var.get(), plan,
+                                                   rng=frame_rng(self.preview_seed, current_idx))
+                
+                # Zapisz tymczasowo i zachowaj w cache
+                result_img.save(temp_path)
+                if key is not None:
+                    self.render_cache.store(key, temp_path)
+            self.load_preview_file(temp_path)
             
             self.log(f"Podgląd klatki {current_idx + 1} z efektami: {', '.join(enabled_effects)}")
             
@@ -1684,6 +1778,28 @@ class App:
             messagebox.showerror("Błąd", f"Nie można wygenerować podglądu:\n{str(e)}")
             self.log(f"❌ Błąd podglądu: {str(e)}")
     
+    def new_preview_temp_path(self):
+        """Unikalny plik tymczasowy podglądu; plik poprzedniego podglądu jest usuwany."""
+        self.remove_preview_temp()
+        fd, temp_path = tempfile.mkstemp(prefix='glitchlab_preview_', suffix='.png')
+        os.close(fd)
+        self.preview_temp_path = temp_path
+        return temp_path
+    
+    def load_preview_file(self, temp_path):
+        """Ładuje plik podglądu do odtwarzacza wyniku i usuwa go po zdekodowaniu klatki."""
+        def on_loaded(count):
+            # Klatka jest już zdekodowana w odtwarzaczu (show_frame przed on_complete)
+            if self.preview_temp_path == temp_path:
+                self.remove_preview_temp()
+        self.output_player.load_frames([temp_path], on_complete=on_loaded)
+    
+    def remove_preview_temp(self):
+        """Usuwa plik tymczasowy ostatniego podglądu, jeśli istnieje."""
+        if self.preview_temp_path and os.path.exists(self.preview_temp_path):
+            os.remove(self.preview_temp_path)
+        self.preview_temp_path = None
+    
     def open_animation_editor(self):
         """Otwiera edytor zaawansowanej animacji."""
         if not self.original_player.frames:
@@ -1739,6 +1855,12 @@ class App:
         if not os.path.exists(input_dir):
             messagebox.showerror(language_manager.t('status_error'), language_manager.t('error_input_not_exists'))
             return
+        seed_text = self.seed_var.get().strip()
+        try:
+            seed = int(seed_text) if seed_text else None
+        except ValueError:
+            messagebox.showerror(language_manager.t('status_error'), language_manager.t('error_invalid_seed'))
+            return
         if not output_dir:
             output_dir = input_dir + "_glitched"
             self.output_var.set(output_dir)
@@ -1765,42 +1887,96 @@ class App:
         self.log(language_manager.t('log_intensity_mode_info', mode=anim_params['intensity_mode']))
         if self.advanced_mode_var.get():
             self.log(language_manager.t('log_advanced_mode_info'))
+        incremental = self.incremental_var.get()
+        if incremental:
+            self.log(language_manager.t('log_incremental_info'))
+        if seed is not None:
+            self.log(language_manager.t('log_seed_info', seed=seed))
         
         self.start_btn.config(state=tk.DISABLED)
+        self.pause_btn.config(state=tk.NORMAL, text=language_manager.t('pause_render'))
+        self.cancel_btn.config(state=tk.NORMAL)
         self.status_var.set(language_manager.t('status_processing'))
         self.progress['value'] = 0
-        
-        def process():
-            # Użyj mnożnika tylko jeśli jest włączony, w przeciwnym razie 1
-            multiplier = self.multiplier_var.get() if self.multiplier_enabled_var.get() else 1
-            count, error = process_frames(
-                input_dir, output_dir,
-                multiplier,
-                self.intensity_var.get(),
-                enabled_effects,
-                self.glitch_enabled_var.get(),
-                anim_params,
-                effect_params,
-                self.update_progress_with_log
-            )
-            self.root.after(0, lambda: self.finish_process(count, error))
-        
-        threading.Thread(target=process, daemon=True).start()
-    
-    def update_progress_with_log(self, value):
-        """Aktualizuje progress i loguje komunikaty."""
-        if isinstance(value, str):
-            # Komunikat tekstowy
-            self.root.after(0, lambda msg=value: self.log(msg))
-        else:
-            # Wartość procentowa - aktualizuj pasek postępu natychmiast
-            self.progress['value'] = value
+        self._last_logged_progress = -1
+        
+        # Wątek renderu tylko zapisuje do kanału postępu i stanu zadania; UI odbiera je
+        # w poll_render_job (wątek Tk), który też kończy render przez finish_process
+        self.progress_channel = ProgressChannel()
+        
+        # Render w tle jako RenderJob - można go wstrzymać lub przerwać między klatkami
+        self.render_job = RenderJob(
+            input_dir, output_dir,
+            multiplier,
+            self.intensity_var.get(),
+            enabled_effects,
+            self.glitch_enabled_var.get(),
+            anim_params,
+            effect_params,
+            self.progress_channel,
+            resume=incremental,
+            seed=seed,
+            cache=self.render_cache if self.frame_cache_var.get() else None
+        )
+        self.render_job.start()
+        self.poll_render_job()
+    
+    def poll_render_job(self):
+        """Odbiera postęp z kanału i odświeża status renderu (klatki, przepustowość, ETA)."""
+        job = self.render_job
+        if job is None:
+            return
+        if job.finished:
+            self.finish_process(*job.result)
+            return
+        self.drain_progress()
+        if job.status == RenderJob.PAUSED:
+            self.status_var.set(language_manager.t('status_paused', done=job.done, total=job.total))
+        elif job.total:
+            self.status_var.set(language_manager.t('status_job_progress', done=job.done, total=job.total,
+                                                   fps=f"{job.fps:.1f}", eta=format_duration(job.eta)))
+        self.root.after(PROGRESS_POLL_MS, self.poll_render_job)
+    
+    def drain_progress(self):
+        """Przenosi zebrany postęp renderu do UI - scalony do jednej aktualizacji."""
+        channel = getattr(self, 'progress_channel', None)
+        if channel is None:
+            return
+        percent, messages, dropped = channel.drain()
+        dropped += max(0, len(messages) - LOG_LINES_PER_POLL)
+        messages = messages[-LOG_LINES_PER_POLL:]
+        if dropped:
+            messages.insert(0, language_manager.t('log_messages_skipped', count=dropped))
+        if percent is not None:
+            self.progress['value'] = percent
             # Loguj co 5% zamiast co 10% dla lepszej informacji zwrotnej
-            if int(value) % 5 == 0 and int(value) != int(getattr(self, '_last_logged_progress', -1)):
-                self._last_logged_progress = int(value)
-                self.root.after(0, lambda v=value: self.log(language_manager.t('log_progress', percent=int(v))))
-        # Wymuszaj odświeżenie interfejsu dla płynnej aktualizacji
-        self.root.update_idletasks()
+            if int(percent) % 5 == 0 and int(percent) != self._last_logged_progress:
+                self._last_logged_progress = int(percent)
+                messages.append(language_manager.t('log_progress', percent=int(percent)))
+        self.log_lines(messages)
+    
+    def toggle_pause_process(self):
+        """Wstrzymuje lub wznawia trwający render."""
+        job = self.render_job
+        if job is None:
+            return
+        if job.status == RenderJob.PAUSED:
+            job.resume()
+            self.pause_btn.config(text=language_manager.t('pause_render'))
+            self.log(language_manager.t('log_render_resumed'))
+        elif job.status == RenderJob.RUNNING:
+            job.pause()
+            self.pause_btn.config(text=language_manager.t('resume_render'))
+            self.log(language_manager.t('log_render_paused'))
+    
+    def cancel_process(self):
+        """Przerywa trwający render po bieżącej klatce."""
+        if self.render_job is None:
+            return
+        self.render_job.cancel()
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.pause_btn.config(state=tk.DISABLED)
+        self.status_var.set(language_manager.t('status_cancelling'))
     
     def update_progress_only(self, value):
         """Aktualizuje tylko pasek postępu bez logowania (dla częstych aktualizacji)."""
@@ -1810,8 +1986,22 @@ class App:
     
     def finish_process(self, count, error):
         """Kończy proces przetwarzania."""
+        job = self.render_job
+        self.render_job = None
+        self.drain_progress()
+        self.progress_channel = None
         self.start_btn.config(state=tk.NORMAL)
-        if error:
+        self.pause_btn.config(state=tk.DISABLED, text=language_manager.t('pause_render'))
+        self.cancel_btn.config(state=tk.DISABLED)
+        if job is not None and job.status == RenderJob.CANCELLED:
+            # Pełny render bez cache nie liczy skrótów źródeł (src=None w manifeście), więc
+            # podpowiedź o dokończeniu pokazujemy tylko po przerwaniu renderu przyrostowego
+            self.status_var.set(language_manager.t('status_cancelled', count=job.done))
+            key = 'log_render_cancelled_resumable' if job.options.get('resume') else 'log_render_cancelled'
+            self.log(language_manager.t(key, done=job.done, total=job.total))
+            self.output_player.load_from_directory(self.output_var.get(), self.log,
+                                                   on_complete=lambda count: self.update_sync_slider_range())
+        elif error:
             self.status_var.set(language_manager.t('status_error'))
             self.log(language_manager.t('log_error', error=error))
             messagebox.showerror(language_manager.t('status_error'), error)
@@ -1819,16 +2009,20 @@ class App:
             self.status_var.set(language_manager.t('status_complete', count=count))
             self.log(language_manager.t('log_completed', count=count))
             self.log(language_manager.t('log_saved_to', path=self.output_var.get()))
-            self.output_player.load_from_directory(self.output_var.get(), self.log)
-            self.update_sync_slider_range()
+            self.output_player.load_from_directory(self.output_var.get(), self.log,
+                                                   on_complete=lambda count: self.update_sync_slider_range())
             self.log(language_manager.t('log_result_loaded'))
             messagebox.showinfo(language_manager.t('status_complete', count=count), language_manager.t('success_frames_created', count=count))
     
     # Preview synchronization methods
     def play_both(self):
-        """Odtwarza oba podglądy jednocześnie."""
-        self.original_player.play()
-        self.output_player.play()
+        """Odtwarza oba podglądy jednocześnie, na wspólnym zegarze."""
+        if self.sync_var.get():
+            # Start obu podglądów z tej samej klatki
+            self.on_sync_slider(self.sync_slider.get())
+        clock = PlaybackClock(self.original_player.fps_var.get())
+        self.original_player.play(clock=clock)
+        self.output_player.play(clock=clock)
         self.log(language_manager.t('log_playing_both'))
     
     def stop_both(self):